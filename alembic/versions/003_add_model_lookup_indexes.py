@@ -0,0 +1,35 @@
+"""Add model lookup indexes
+
+Revision ID: 003_add_model_lookup_indexes
+Revises: 002_create_model_registry_tables
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_model_lookup_indexes'
+down_revision: Union[str, None] = '002_create_model_registry_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (model_id, version_tag) serves the duplicate-tag check and also enforces it,
+    # closing the race between the check and the insert.
+    op.create_index(
+        op.f('ix_model_versions_model_id_version_tag'),
+        'model_versions',
+        ['model_id', 'version_tag'],
+        unique=True
+    )
+    # Model names are not unique per user, so this one is a plain lookup index.
+    op.create_index(op.f('ix_models_user_id_name'), 'models', ['user_id', 'name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_models_user_id_name'), table_name='models')
+    op.drop_index(op.f('ix_model_versions_model_id_version_tag'), table_name='model_versions')
@@ -0,0 +1,49 @@
+"""Use server-side timezone-aware timestamps
+
+Revision ID: 004_server_side_timestamps
+Revises: 003_add_model_lookup_indexes
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_server_side_timestamps'
+down_revision: Union[str, None] = '003_add_model_lookup_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'models', 'model_versions', 'deployments')
+COLUMNS = ('created_at', 'updated_at')
+
+
+def upgrade() -> None:
+    # Existing values were written by datetime.utcnow(), so interpret them as UTC
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                existing_nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                server_default=None,
+                existing_nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
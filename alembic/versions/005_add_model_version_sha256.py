@@ -0,0 +1,29 @@
+"""Record the SHA-256 of each version's uploaded model file
+
+Revision ID: 005_add_model_version_sha256
+Revises: 004_server_side_timestamps
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_add_model_version_sha256'
+down_revision: Union[str, None] = '004_server_side_timestamps'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable: versions uploaded before this migration have no recorded digest
+    op.add_column('model_versions', sa.Column('sha256', sa.String(length=64), nullable=True))
+    # Serves the duplicate-artifact lookup on upload
+    op.create_index(op.f('ix_model_versions_sha256'), 'model_versions', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_model_versions_sha256'), table_name='model_versions')
+    op.drop_column('model_versions', 'sha256')
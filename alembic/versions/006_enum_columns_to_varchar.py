@@ -0,0 +1,78 @@
+"""Store model type and version status as VARCHAR + CHECK
+
+Revision ID: 006_enum_columns_to_varchar
+Revises: 005_add_model_version_sha256
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006_enum_columns_to_varchar'
+down_revision: Union[str, None] = '005_add_model_version_sha256'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Native enums become VARCHAR, so adding a value later is a constraint
+    # swap instead of ALTER TYPE
+    op.alter_column(
+        'models',
+        'type',
+        existing_type=postgresql.ENUM(name='modeltype', create_type=False),
+        type_=sa.String(length=16),
+        existing_nullable=False,
+        postgresql_using='type::text'
+    )
+    op.alter_column(
+        'model_versions',
+        'status',
+        existing_type=postgresql.ENUM(name='modelversionsstatus', create_type=False),
+        type_=sa.String(length=16),
+        existing_nullable=False,
+        postgresql_using='status::text'
+    )
+
+    # Rows hold enum names (SKLEARN, BUILDING); the models now store values
+    op.execute("UPDATE models SET type = lower(type)")
+    op.execute("UPDATE model_versions SET status = initcap(status)")
+
+    op.create_check_constraint('ck_models_type', 'models', "type IN ('sklearn', 'pytorch')")
+    op.create_check_constraint(
+        'ck_model_versions_status', 'model_versions', "status IN ('Building', 'Ready', 'Failed')"
+    )
+
+    # Drop enums
+    op.execute("DROP TYPE IF EXISTS modelversionsstatus")
+    op.execute("DROP TYPE IF EXISTS modeltype")
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_model_versions_status', 'model_versions', type_='check')
+    op.drop_constraint('ck_models_type', 'models', type_='check')
+
+    # Recreate the enums with the names the previous models stored
+    op.execute("CREATE TYPE modeltype AS ENUM ('SKLEARN', 'PYTORCH')")
+    op.execute("CREATE TYPE modelversionsstatus AS ENUM ('BUILDING', 'READY', 'FAILED')")
+
+    op.alter_column(
+        'models',
+        'type',
+        existing_type=sa.String(length=16),
+        type_=postgresql.ENUM(name='modeltype', create_type=False),
+        existing_nullable=False,
+        postgresql_using='upper(type)::modeltype'
+    )
+    op.alter_column(
+        'model_versions',
+        'status',
+        existing_type=sa.String(length=16),
+        type_=postgresql.ENUM(name='modelversionsstatus', create_type=False),
+        existing_nullable=False,
+        postgresql_using='upper(status)::modelversionsstatus'
+    )
@@ -0,0 +1,43 @@
+"""Replace parent-id indexes with (parent_id, id) composites
+
+Revision ID: 007_composite_owner_indexes
+Revises: 006_enum_columns_to_varchar
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_composite_owner_indexes'
+down_revision: Union[str, None] = '006_enum_columns_to_varchar'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (user_id, id) matches the per-user lookups: WHERE user_id = ? [AND id = ?] ORDER BY id.
+    # Each composite also covers the single-column index it replaces.
+    op.create_index(op.f('ix_models_user_id_id'), 'models', ['user_id', 'id'], unique=False)
+    op.create_index(
+        op.f('ix_model_versions_model_id_id'), 'model_versions', ['model_id', 'id'], unique=False
+    )
+    op.create_index(
+        op.f('ix_deployments_version_id_id'), 'deployments', ['version_id', 'id'], unique=False
+    )
+
+    op.drop_index(op.f('ix_models_user_id'), table_name='models')
+    op.drop_index(op.f('ix_model_versions_model_id'), table_name='model_versions')
+    op.drop_index(op.f('ix_deployments_version_id'), table_name='deployments')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_deployments_version_id'), 'deployments', ['version_id'], unique=False)
+    op.create_index(op.f('ix_model_versions_model_id'), 'model_versions', ['model_id'], unique=False)
+    op.create_index(op.f('ix_models_user_id'), 'models', ['user_id'], unique=False)
+
+    op.drop_index(op.f('ix_deployments_version_id_id'), table_name='deployments')
+    op.drop_index(op.f('ix_model_versions_model_id_id'), table_name='model_versions')
+    op.drop_index(op.f('ix_models_user_id_id'), table_name='models')
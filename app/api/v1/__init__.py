@@ -2,16 +2,23 @@
 API v1 routes package.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.core.dependencies import get_current_user
 
 router = APIRouter()
 
+# Routes that require a valid access token. The token check runs once per
+# request and is shared with any route that also asks for the current user.
+protected = APIRouter(dependencies=[Depends(get_current_user)])
+
 # Import and include route modules here
 from app.api.v1 import auth  # noqa: E402
 from app.api.v1 import me  # noqa: E402
 from app.api.v1 import models  # noqa: E402
 
 router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-router.include_router(me.router, tags=["users"])
-router.include_router(models.router, tags=["models"])
+protected.include_router(me.router, tags=["users"])
+protected.include_router(models.router, tags=["models"])
+router.include_router(protected)
 
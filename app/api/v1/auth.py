@@ -32,16 +32,7 @@ async def register(
         HTTPException: If email already exists or validation fails
     """
     service = UserService(db)
-    try:
-        user = await service.create_user(user_data)
-        return user
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create user: {str(e)}"
-        )
+    return await service.create_user(user_data)
 
 
 @router.post("/login", response_model=Token)
@@ -3,17 +3,15 @@ Current user endpoints.
 Example of protected routes using authentication dependency.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from app.schemas.user import UserResponse
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import ActiveUser
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
-    current_user: UserResponse = Depends(get_current_active_user)
-):
+async def get_current_user_info(current_user: ActiveUser):
     """
     Get current authenticated user information.
 
@@ -3,11 +3,12 @@ Model registry API routes.
 Handles model, model version, and deployment operations.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, status, UploadFile, File
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File
+from pydantic import TypeAdapter
 
-from app.database import get_db
+from app.config import settings
 from app.schemas.model import (
     ModelCreate,
     ModelResponse,
@@ -22,19 +23,76 @@ from app.services.model_service import (
     DeploymentService,
 )
 from app.services.storage_service import StorageService
-from app.core.dependencies import get_current_active_user
-from app.schemas.user import UserResponse
+from app.core.dependencies import CurrentUser, DbSession, get_storage
 from app.models.model import ModelVersionStatus
 
 router = APIRouter()
 
+# Page size limits for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Serializers for the service results. Routes return the rendered JSON directly,
+# so FastAPI does not re-validate the already-typed results against response_model
+# (which is still used for the OpenAPI schema).
+_MODEL = TypeAdapter(ModelResponse)
+_MODEL_LIST = TypeAdapter(List[ModelResponse])
+_VERSION = TypeAdapter(ModelVersionResponse)
+_VERSION_LIST = TypeAdapter(List[ModelVersionResponse])
+_DEPLOYMENT = TypeAdapter(DeploymentResponse)
+_DEPLOYMENT_LIST = TypeAdapter(List[DeploymentResponse])
+
+
+# Response header carrying the keyset cursor for the next page of a list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _json_response(
+    adapter: TypeAdapter, payload: Any, status_code: int = status.HTTP_200_OK
+) -> Response:
+    """
+    Render a service result to a JSON response in a single pass.
+
+    Args:
+        adapter: Serializer for the payload's type
+        payload: Response schema instance or list of instances
+        status_code: HTTP status code
+
+    Returns:
+        JSON response
+    """
+    return Response(
+        content=adapter.dump_json(payload),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _page_response(adapter: TypeAdapter, items: List[Any], limit: int) -> Response:
+    """
+    Render a page of a list endpoint, adding the next-page cursor when the
+    page is full.
+
+    Args:
+        adapter: Serializer for the list type
+        items: Page of response schema instances, ordered by ID
+        limit: Requested page size
+
+    Returns:
+        JSON response
+    """
+    response = _json_response(adapter, items)
+    if len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(items[-1].id)
+    return response
+
 
 # Model Routes
 @router.post("/models", response_model=ModelResponse, status_code=status.HTTP_201_CREATED)
 async def create_model(
     model_data: ModelCreate,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Create a new model.
@@ -48,33 +106,42 @@ async def create_model(
         Created model response
     """
     service = ModelService(db)
-    return await service.create_model(model_data, current_user.id)
+    model = await service.create_model(model_data, current_user.id)
+    return _json_response(_MODEL, model, status.HTTP_201_CREATED)
 
 
 @router.get("/models", response_model=List[ModelResponse])
 async def get_models(
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="Return items after this ID"),
 ):
     """
     Get all models for the current user.
+    Full pages carry the cursor for the next page in the X-Next-Cursor header.
 
     Args:
         current_user: Current authenticated user
         db: Database session
+        offset: Number of items to skip
+        limit: Maximum number of items to return
+        after: Keyset cursor from a previous page
 
     Returns:
         List of model responses
     """
     service = ModelService(db)
-    return await service.get_all_models(current_user.id)
+    models = await service.get_all_models(current_user.id, offset, limit, after)
+    return _page_response(_MODEL_LIST, models, limit)
 
 
 @router.get("/models/{model_id}", response_model=ModelResponse)
 async def get_model(
     model_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Get a model by ID.
@@ -88,14 +155,14 @@ async def get_model(
         Model response
     """
     service = ModelService(db)
-    return await service.get_model(model_id, current_user.id)
+    return _json_response(_MODEL, await service.get_model(model_id, current_user.id))
 
 
 @router.delete("/models/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_model(
     model_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Delete a model.
@@ -118,8 +185,8 @@ async def delete_model(
 async def create_model_version(
     model_id: int,
     version_data: ModelVersionCreate,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Create a new model version.
@@ -137,7 +204,8 @@ async def create_model_version(
     version_data.model_id = model_id
 
     service = ModelVersionService(db)
-    return await service.create_version(version_data, current_user.id)
+    version = await service.create_version(version_data, current_user.id)
+    return _json_response(_VERSION, version, status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -145,29 +213,39 @@ async def create_model_version(
 )
 async def get_model_versions(
     model_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = Query(None, ge=0, description="Return items after this ID"),
 ):
     """
     Get all versions for a model.
+    Full pages carry the cursor for the next page in the X-Next-Cursor header.
 
     Args:
         model_id: Model ID
         current_user: Current authenticated user
         db: Database session
+        offset: Number of items to skip
+        limit: Maximum number of items to return
+        after: Keyset cursor from a previous page
 
     Returns:
         List of model version responses
     """
     service = ModelVersionService(db)
-    return await service.get_versions_by_model(model_id, current_user.id)
+    versions = await service.get_versions_by_model(
+        model_id, current_user.id, offset, limit, after
+    )
+    return _page_response(_VERSION_LIST, versions, limit)
 
 
 @router.get("/versions/{version_id}", response_model=ModelVersionResponse)
 async def get_model_version(
     version_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Get a model version by ID.
@@ -181,15 +259,15 @@ async def get_model_version(
         Model version response
     """
     service = ModelVersionService(db)
-    return await service.get_version(version_id, current_user.id)
+    return _json_response(_VERSION, await service.get_version(version_id, current_user.id))
 
 
 @router.patch("/versions/{version_id}/status", response_model=ModelVersionResponse)
 async def update_version_status(
     version_id: int,
     status: ModelVersionStatus,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Update a model version status.
@@ -204,7 +282,8 @@ async def update_version_status(
         Updated model version response
     """
     service = ModelVersionService(db)
-    return await service.update_version_status(version_id, status, current_user.id)
+    version = await service.update_version_status(version_id, status, current_user.id)
+    return _json_response(_VERSION, version)
 
 
 @router.post(
@@ -214,49 +293,70 @@ async def update_version_status(
 )
 async def upload_model_artifacts(
     version_id: int,
+    current_user: CurrentUser,
+    db: DbSession,
     file: UploadFile = File(..., description="Model file (e.g., model.joblib)", alias="model_file"),
     requirements: UploadFile = File(..., description="Requirements file (requirements.txt)", alias="requirements_file"),
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    storage_service: StorageService = Depends(get_storage),
 ):
     """
     Upload model artifacts (model file and requirements.txt) for a version.
 
     Args:
         version_id: Version ID
-        model_file: Model file (joblib, pkl, or pickle)
-        requirements_file: Requirements.txt file
         current_user: Current authenticated user
         db: Database session
+        model_file: Model file (joblib, pkl, or pickle)
+        requirements_file: Requirements.txt file
+        storage_service: Shared storage service
 
     Returns:
         Updated model version response with s3_path
     """
-    # Verify version exists and user owns it
+    # Verify version exists and user owns it, loading the model name alongside
     version_service = ModelVersionService(db)
-    version = await version_service.get_version(version_id, current_user.id)
-    
-    # Get model to get model name
-    model_service = ModelService(db)
-    model = await model_service.get_model(version.model_id, current_user.id)
-    
-    # Upload files to S3
-    storage_service = StorageService()
-    model_s3_path, requirements_s3_path = await storage_service.upload_model_artifacts(
-        user_id=current_user.id,
-        model_name=model.name,
-        version_tag=version.version_tag,
-        model_file=file,
-        requirements_file=requirements,
+    version, model = await version_service.get_version_with_model(
+        version_id, current_user.id
     )
+
+    # Reject bad or oversized files before anything is changed
+    model_size, requirements_size = storage_service.validate_artifacts(file, requirements)
+
+    # If the user already stored a model file with this content, it is
+    # copied inside Minio instead of being uploaded again
+    model_sha256 = await storage_service.model_file_sha256(file)
+    model_source = await version_service.find_model_artifact(model_sha256, current_user.id)
+
+    # Upload files to S3; the version keeps its status unless this succeeds
+    try:
+        model_s3_path, requirements_s3_path = await asyncio.wait_for(
+            storage_service.upload_model_artifacts(
+                user_id=current_user.id,
+                model_name=model.name,
+                version_tag=version.version_tag,
+                model_file=file,
+                requirements_file=requirements,
+                model_size=model_size,
+                requirements_size=requirements_size,
+                model_sha256=model_sha256,
+                model_source=model_source,
+            ),
+            timeout=settings.MINIO_UPLOAD_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Model artifact upload timed out",
+        )
     
     # Update version with model S3 path (we store the model path, requirements is implicit)
-    # The s3_path in the database represents the model file path
+    # The s3_path in the database represents the model file path, and the
+    # version goes back to BUILDING until the new artifacts are built
     updated_version = await version_service.update_version_s3_path(
-        version_id, model_s3_path, current_user.id
+        version_id, model_s3_path, current_user.id, sha256=model_sha256
     )
-    
-    return updated_version
+
+    return _json_response(_VERSION, updated_version)
 
 
 # Deployment Routes
@@ -268,8 +368,8 @@ async def upload_model_artifacts(
 async def create_deployment(
     version_id: int,
     deployment_data: DeploymentCreate,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Create a new deployment for a model version.
@@ -287,7 +387,8 @@ async def create_deployment(
     deployment_data.version_id = version_id
 
     service = DeploymentService(db)
-    return await service.create_deployment(deployment_data, current_user.id)
+    deployment = await service.create_deployment(deployment_data, current_user.id)
+    return _json_response(_DEPLOYMENT, deployment, status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -295,8 +396,10 @@ async def create_deployment(
 )
 async def get_deployments(
     version_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
     """
     Get all deployments for a model version.
@@ -305,19 +408,24 @@ async def get_deployments(
         version_id: Version ID
         current_user: Current authenticated user
         db: Database session
+        offset: Number of items to skip
+        limit: Maximum number of items to return
 
     Returns:
         List of deployment responses
     """
     service = DeploymentService(db)
-    return await service.get_deployments_by_version(version_id, current_user.id)
+    deployments = await service.get_deployments_by_version(
+        version_id, current_user.id, offset, limit
+    )
+    return _json_response(_DEPLOYMENT_LIST, deployments)
 
 
 @router.get("/deployments/{deployment_id}", response_model=DeploymentResponse)
 async def get_deployment(
     deployment_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Get a deployment by ID.
@@ -331,14 +439,15 @@ async def get_deployment(
         Deployment response
     """
     service = DeploymentService(db)
-    return await service.get_deployment(deployment_id, current_user.id)
+    deployment = await service.get_deployment(deployment_id, current_user.id)
+    return _json_response(_DEPLOYMENT, deployment)
 
 
 @router.delete("/deployments/{deployment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_deployment(
     deployment_id: int,
-    current_user: UserResponse = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+    db: DbSession,
 ):
     """
     Delete a deployment.
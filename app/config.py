@@ -3,6 +3,7 @@ Application configuration using pydantic-settings.
 Loads configuration from environment variables with validation.
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -21,10 +22,17 @@ class Settings(BaseSettings):
     APP_NAME: str = "KubeServe"
     APP_VERSION: str = "0.1.0"
     DEBUG: bool = False
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json" (one JSON object per line)
 
     # Database
     DATABASE_URL: str
     DATABASE_ECHO: bool = False  # Set to True for SQL query logging
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is recycled
+    DB_STATEMENT_CACHE_SIZE: int = 256  # asyncpg prepared statements cached per connection
+    DB_QUERY_CACHE_SIZE: int = 1200  # SQLAlchemy compiled statement cache entries
 
     # Minio/S3
     MINIO_ENDPOINT: str
@@ -32,21 +40,35 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str
     MINIO_BUCKET_NAME: str = "kubeserve-models"
     MINIO_USE_SSL: bool = False
+    MINIO_UPLOAD_TIMEOUT: int = 300  # Upper bound for an artifact upload (seconds)
 
     # JWT Authentication
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost for new password hashes (each +1 doubles hashing time)
 
     # Kubernetes
     KUBECONFIG: Optional[str] = None  # Path to kubeconfig file, None uses default
     INGRESS_HOST: str = "localhost"  # Ingress hostname
     INGRESS_BASE_PATH: str = "/api/v1/predict"  # Base path for prediction endpoints
+    HELM_MAX_CONCURRENCY: int = 8  # Helm processes allowed to run at once per API process
 
     # CORS
-    CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:3001"]
+    CORS_ORIGINS: tuple[str, ...] = ("http://localhost:3000", "http://localhost:3001")
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the application settings, parsing the environment only once.
+
+    Returns:
+        Cached settings instance
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
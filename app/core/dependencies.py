@@ -2,81 +2,135 @@
 FastAPI dependencies for authentication and authorization.
 """
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
 from app.database import get_db
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token_async
 from app.schemas.user import TokenData
+from app.services.storage_service import StorageService
 from app.services.user_service import UserService
 from app.schemas.user import UserResponse
 
 # HTTP Bearer token scheme
-security = HTTPBearer()
+security = HTTPBearer(auto_error=True, bearerFormat="JWT")
+
+
+def _credentials_error() -> HTTPException:
+    """
+    Build the 401 raised for any authentication failure.
+
+    Returns:
+        A new credentials exception
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
 ) -> UserResponse:
     """
     Dependency to get the current authenticated user from JWT token.
 
+    The decoded claims are stashed on ``request.state.jwt_claims``. The
+    user is checked to still exist through the TTL-cached
+    UserService.get_user_by_id, so most requests make no database round
+    trip, and a token for a deleted or unknown user is rejected. The
+    returned profile comes from that cache and may be up to its TTL old.
+
     Args:
+        request: Incoming request
         credentials: HTTP Bearer token credentials
-        db: Database session
+        db: Database session (used only on a cache miss)
 
     Returns:
-        Current user response
+        Cached user response for the token's subject
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or the user does not exist
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
     try:
         token = credentials.credentials
-        payload = decode_access_token(token)
+        payload = await decode_access_token_async(token)
         user_id: Optional[int] = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_error()
         token_data = TokenData(user_id=int(user_id), email=payload.get("email"))
     except JWTError:
-        raise credentials_exception
+        raise _credentials_error() from None
 
     if token_data.user_id is None:
-        raise credentials_exception
+        raise _credentials_error()
 
-    service = UserService(db)
-    user = await service.get_user_by_id(token_data.user_id)
+    user = await UserService(db).get_user_by_id(token_data.user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_error()
 
+    request.state.jwt_claims = payload
     return user
 
 
 async def get_current_active_user(
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ) -> UserResponse:
     """
     Dependency to get the current active user.
-    Can be extended to check if user is active/not banned.
+    Loads the user from the database, so it can be extended to check
+    if user is active/not banned.
 
     Args:
         current_user: Current user from get_current_user dependency
+        db: Database session
 
     Returns:
         Current active user
+
+    Raises:
+        HTTPException: If the user no longer exists
     """
+    service = UserService(db)
+    user = await service.get_user_by_id(current_user.id)
+    if user is None:
+        raise _credentials_error()
+
     # Future: Add active/banned check here
     # if not current_user.is_active:
     #     raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
+    return user
+
+
+def get_storage(request: Request) -> StorageService:
+    """
+    Dependency to get the application-wide storage service.
+
+    The service (and its Minio connection pool) is created on first use and
+    kept on ``app.state`` for the lifetime of the application, so uploads
+    reuse the same client instead of building one per request.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Shared storage service
+    """
+    storage = getattr(request.app.state, "storage", None)
+    if storage is None:
+        storage = StorageService()
+        request.app.state.storage = storage
+    return storage
+
 
+# Annotated shortcuts so routes declare shared dependencies once
+CurrentUser = Annotated[UserResponse, Depends(get_current_user)]
+ActiveUser = Annotated[UserResponse, Depends(get_current_active_user)]
+DbSession = Annotated[AsyncSession, Depends(get_db)]
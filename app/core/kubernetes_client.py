@@ -3,16 +3,58 @@ Kubernetes client wrapper for namespace and resource management.
 Handles namespace creation, ResourceQuotas, and NetworkPolicies.
 """
 
+import copy
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 from typing import List, Dict, Optional
 
 from app.config import settings
+from app.core.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# How long a namespace existence lookup (positive or negative) is trusted
+_NS_TTL = 30.0
+
+# Upper bound on concurrent namespace setups during bulk provisioning
+_BULK_SETUP_WORKERS = 10
+
+# Connections kept to the API server; each bulk worker may have a quota and a
+# network policy request in flight at once
+_API_POOL_MAXSIZE = 2 * _BULK_SETUP_WORKERS + 4
+
+# Request bodies are plain dicts in the wire (camelCase) shape, built once and
+# cloned per call instead of re-running the validating client.V1* constructors.
+_RQ_TEMPLATE = {
+    "apiVersion": "v1",
+    "kind": "ResourceQuota",
+    "metadata": {"name": "user-resource-quota", "namespace": None},
+    "spec": {"hard": {}},
+}
+
+_NETPOL_TEMPLATE = {
+    "apiVersion": "networking.k8s.io/v1",
+    "kind": "NetworkPolicy",
+    "metadata": {"name": "deny-all-egress-allow-minio-pypi", "namespace": None},
+    "spec": {
+        "podSelector": {},  # Applies to all pods in namespace
+        "policyTypes": ["Egress"],
+        "egress": [
+            # Allow DNS (required for all network operations)
+            {"to": [], "ports": [{"protocol": "UDP", "port": 53}, {"protocol": "TCP", "port": 53}]},
+            # Allow egress to Minio (port filled in per call)
+            {"to": [], "ports": [{"protocol": "TCP", "port": None}]},
+            # Allow HTTPS (port 443) for PyPI and other secure services
+            # This allows pip install from pypi.org
+            {"to": [], "ports": [{"protocol": "TCP", "port": 443}]},
+        ],
+    },
+}
+
 
 class KubernetesClient:
     """
@@ -20,24 +62,52 @@ class KubernetesClient:
     Handles namespace creation, ResourceQuotas, and NetworkPolicies.
     """
 
-    def __init__(self):
-        """Initialize Kubernetes client with configuration."""
-        try:
-            if settings.KUBECONFIG:
-                config.load_kube_config(config_file=settings.KUBECONFIG)
-            else:
-                config.load_kube_config()  # Uses default ~/.kube/config
-            logger.info("Kubernetes client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to load Kubernetes config: {str(e)}")
-            raise
+    def __init__(
+        self,
+        core_v1: Optional[client.CoreV1Api] = None,
+        networking_v1: Optional[client.NetworkingV1Api] = None,
+    ):
+        """
+        Initialize Kubernetes client with configuration.
+
+        Args:
+            core_v1: Existing CoreV1Api to reuse (skips kubeconfig loading
+                when given together with networking_v1)
+            networking_v1: Existing NetworkingV1Api to reuse
+        """
+        if core_v1 is None or networking_v1 is None:
+            try:
+                if settings.KUBECONFIG:
+                    config.load_kube_config(config_file=settings.KUBECONFIG)
+                else:
+                    config.load_kube_config()  # Uses default ~/.kube/config
+                logger.info("Kubernetes client initialized successfully")
+            except Exception as e:
+                logger.error("Failed to load Kubernetes config: %s", e)
+                raise
 
-        self.core_v1 = client.CoreV1Api()
-        self.networking_v1 = client.NetworkingV1Api()
+            # One ApiClient (and urllib3 pool) shared by both API groups, so
+            # connections to the API server are reused across them
+            configuration = client.Configuration.get_default_copy()
+            configuration.connection_pool_maxsize = _API_POOL_MAXSIZE
+            api_client = client.ApiClient(configuration)
+            core_v1 = core_v1 or client.CoreV1Api(api_client)
+            networking_v1 = networking_v1 or client.NetworkingV1Api(api_client)
+
+        self.core_v1 = core_v1
+        self.networking_v1 = networking_v1
+        # Deployment reads go over the same ApiClient as the core API
+        self.apps_v1 = client.AppsV1Api(core_v1.api_client)
+        # Namespace name -> exists, for both hits and 404 misses
+        self._ns_cache = TTLCache(maxsize=1024, ttl=_NS_TTL)
+        # User ID -> in-flight namespace setup, shared by concurrent callers
+        self._ns_setup_futures: Dict[int, Future] = {}
+        self._ns_setup_lock = threading.Lock()
 
     def namespace_exists(self, namespace: str) -> bool:
         """
         Check if a namespace exists.
+        Results, including "not found", are cached for a short TTL.
 
         Args:
             namespace: Namespace name
@@ -45,13 +115,22 @@ class KubernetesClient:
         Returns:
             True if namespace exists, False otherwise
         """
+        cached = self._ns_cache.get(namespace)
+        if cached is not None:
+            return cached
+
         try:
             self.core_v1.read_namespace(name=namespace)
-            return True
+            exists = True
         except ApiException as e:
-            if e.status == 404:
-                return False
-            raise
+            if e.status != 404:
+                raise
+            exists = False
+
+        # Stamp the entry after the call completes so slow lookups
+        # don't produce already-expired entries
+        self._ns_cache.set(namespace, exists)
+        return exists
 
     def create_namespace(self, namespace: str, labels: Optional[dict] = None) -> None:
         """
@@ -64,10 +143,7 @@ class KubernetesClient:
         Raises:
             ApiException: If namespace creation fails
         """
-        if self.namespace_exists(namespace):
-            logger.info(f"Namespace {namespace} already exists")
-            return
-
+        # No existence precheck: a 409 from create already means "exists"
         namespace_body = client.V1Namespace(
             metadata=client.V1ObjectMeta(
                 name=namespace,
@@ -77,13 +153,14 @@ class KubernetesClient:
 
         try:
             self.core_v1.create_namespace(body=namespace_body)
-            logger.info(f"Created namespace: {namespace}")
+            logger.info("Created namespace: %s", namespace)
         except ApiException as e:
             if e.status == 409:  # Already exists
-                logger.info(f"Namespace {namespace} already exists")
+                logger.info("Namespace %s already exists", namespace)
             else:
-                logger.error(f"Failed to create namespace {namespace}: {str(e)}")
+                logger.error("Failed to create namespace %s: %s", namespace, e)
                 raise
+        self._ns_cache.set(namespace, True)
 
     def create_resource_quota(
         self,
@@ -104,33 +181,27 @@ class KubernetesClient:
         Raises:
             ApiException: If ResourceQuota creation fails
         """
-        resource_quota = client.V1ResourceQuota(
-            metadata=client.V1ObjectMeta(
-                name="user-resource-quota",
-                namespace=namespace
-            ),
-            spec=client.V1ResourceQuotaSpec(
-                hard={
-                    "requests.cpu": cpu_limit,
-                    "limits.cpu": cpu_limit,
-                    "requests.memory": memory_limit,
-                    "limits.memory": memory_limit,
-                    "pods": str(pods_limit)
-                }
-            )
-        )
+        resource_quota = copy.deepcopy(_RQ_TEMPLATE)
+        resource_quota["metadata"]["namespace"] = namespace
+        resource_quota["spec"]["hard"] = {
+            "requests.cpu": cpu_limit,
+            "limits.cpu": cpu_limit,
+            "requests.memory": memory_limit,
+            "limits.memory": memory_limit,
+            "pods": str(pods_limit)
+        }
 
         try:
             self.core_v1.create_namespaced_resource_quota(
                 namespace=namespace,
                 body=resource_quota
             )
-            logger.info(f"Created ResourceQuota for namespace {namespace}")
+            logger.info("Created ResourceQuota for namespace %s", namespace)
         except ApiException as e:
             if e.status == 409:  # Already exists
-                logger.info(f"ResourceQuota for namespace {namespace} already exists")
+                logger.info("ResourceQuota for namespace %s already exists", namespace)
             else:
-                logger.error(f"Failed to create ResourceQuota for {namespace}: {str(e)}")
+                logger.error("Failed to create ResourceQuota for %s: %s", namespace, e)
                 raise
 
     def create_network_policy(
@@ -153,57 +224,21 @@ class KubernetesClient:
         Raises:
             ApiException: If NetworkPolicy creation fails
         """
-        # Parse minio endpoint to get hostname/IP
-        # Handle both "localhost:9000" and "minio.example.com" formats
-        minio_host = minio_endpoint.split(":")[0] if ":" in minio_endpoint else minio_endpoint
-
-        network_policy = client.V1NetworkPolicy(
-            metadata=client.V1ObjectMeta(
-                name="deny-all-egress-allow-minio-pypi",
-                namespace=namespace
-            ),
-            spec=client.V1NetworkPolicySpec(
-                pod_selector={},  # Applies to all pods in namespace
-                policy_types=["Egress"],
-                egress=[
-                    # Allow DNS (required for all network operations)
-                    client.V1NetworkPolicyEgressRule(
-                        to=[],
-                        ports=[
-                            client.V1NetworkPolicyPort(protocol="UDP", port=53),
-                            client.V1NetworkPolicyPort(protocol="TCP", port=53)
-                        ]
-                    ),
-                    # Allow egress to Minio
-                    client.V1NetworkPolicyEgressRule(
-                        to=[],
-                        ports=[
-                            client.V1NetworkPolicyPort(protocol="TCP", port=minio_port)
-                        ]
-                    ),
-                    # Allow HTTPS (port 443) for PyPI and other secure services
-                    # This allows pip install from pypi.org
-                    client.V1NetworkPolicyEgressRule(
-                        to=[],
-                        ports=[
-                            client.V1NetworkPolicyPort(protocol="TCP", port=443)
-                        ]
-                    )
-                ]
-            )
-        )
+        network_policy = copy.deepcopy(_NETPOL_TEMPLATE)
+        network_policy["metadata"]["namespace"] = namespace
+        network_policy["spec"]["egress"][1]["ports"][0]["port"] = minio_port
 
         try:
             self.networking_v1.create_namespaced_network_policy(
                 namespace=namespace,
                 body=network_policy
             )
-            logger.info(f"Created NetworkPolicy for namespace {namespace}")
+            logger.info("Created NetworkPolicy for namespace %s", namespace)
         except ApiException as e:
             if e.status == 409:  # Already exists
-                logger.info(f"NetworkPolicy for namespace {namespace} already exists")
+                logger.info("NetworkPolicy for namespace %s already exists", namespace)
             else:
-                logger.error(f"Failed to create NetworkPolicy for {namespace}: {str(e)}")
+                logger.error("Failed to create NetworkPolicy for %s: %s", namespace, e)
                 raise
 
     def setup_user_namespace(
@@ -214,6 +249,8 @@ class KubernetesClient:
         """
         Set up a complete isolated namespace for a user.
         Creates namespace, ResourceQuota, and NetworkPolicy.
+        Concurrent calls for the same user share one in-flight setup instead
+        of each repeating the full sequence of Kubernetes API calls.
 
         Args:
             user_id: User ID
@@ -225,6 +262,43 @@ class KubernetesClient:
         Raises:
             ApiException: If any Kubernetes operation fails
         """
+        with self._ns_setup_lock:
+            future = self._ns_setup_futures.get(user_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._ns_setup_futures[user_id] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            namespace = self._setup_user_namespace(user_id, minio_endpoint)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(namespace)
+            return namespace
+        finally:
+            with self._ns_setup_lock:
+                self._ns_setup_futures.pop(user_id, None)
+
+    def _setup_user_namespace(
+        self,
+        user_id: int,
+        minio_endpoint: Optional[str] = None
+    ) -> str:
+        """
+        Create the namespace, ResourceQuota, and NetworkPolicy for a user.
+
+        Args:
+            user_id: User ID
+            minio_endpoint: Minio endpoint (defaults to settings.MINIO_ENDPOINT)
+
+        Returns:
+            Namespace name
+        """
         namespace = f"user-{user_id}"
         minio_endpoint = minio_endpoint or settings.MINIO_ENDPOINT
 
@@ -237,15 +311,56 @@ class KubernetesClient:
             }
         )
 
-        # Create ResourceQuota
-        self.create_resource_quota(namespace)
-
-        # Create NetworkPolicy
-        self.create_network_policy(namespace, minio_endpoint)
+        # ResourceQuota and NetworkPolicy are independent once the namespace
+        # exists, so create them concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            quota = pool.submit(self.create_resource_quota, namespace)
+            policy = pool.submit(self.create_network_policy, namespace, minio_endpoint)
+            quota.result()
+            policy.result()
 
-        logger.info(f"Successfully set up namespace {namespace} for user {user_id}")
+        logger.info("Successfully set up namespace %s for user %s", namespace, user_id)
         return namespace
 
+    def setup_user_namespaces_bulk(
+        self,
+        user_ids: List[int],
+        minio_endpoint: Optional[str] = None,
+        max_workers: int = _BULK_SETUP_WORKERS,
+    ) -> List[Dict[str, Optional[str]]]:
+        """
+        Set up isolated namespaces for many users concurrently.
+        Duplicate user IDs are set up once, and a failure for one user does
+        not stop the rest of the batch.
+
+        Args:
+            user_ids: User IDs to provision
+            minio_endpoint: Minio endpoint (defaults to settings.MINIO_ENDPOINT)
+            max_workers: Maximum number of setups running at once
+
+        Returns:
+            One result per unique user ID, in input order, with keys
+            "user_id", "namespace" (None on failure) and "error" (None on success)
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        if not unique_ids:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids))) as pool:
+            futures = {
+                user_id: pool.submit(self.setup_user_namespace, user_id, minio_endpoint)
+                for user_id in unique_ids
+            }
+
+        results = []
+        for user_id, future in futures.items():
+            try:
+                results.append({"user_id": user_id, "namespace": future.result(), "error": None})
+            except Exception as e:
+                logger.error("Failed to set up namespace for user %s: %s", user_id, e)
+                results.append({"user_id": user_id, "namespace": None, "error": str(e)})
+        return results
+
     def delete_namespace(self, namespace: str) -> None:
         """
         Delete a Kubernetes namespace.
@@ -256,14 +371,16 @@ class KubernetesClient:
         Raises:
             ApiException: If namespace deletion fails
         """
+        # The namespace may linger in Terminating; let the next lookup ask
+        self._ns_cache.pop(namespace)
         try:
             self.core_v1.delete_namespace(name=namespace)
-            logger.info(f"Deleted namespace: {namespace}")
+            logger.info("Deleted namespace: %s", namespace)
         except ApiException as e:
             if e.status == 404:
-                logger.info(f"Namespace {namespace} does not exist")
+                logger.info("Namespace %s does not exist", namespace)
             else:
-                logger.error(f"Failed to delete namespace {namespace}: {str(e)}")
+                logger.error("Failed to delete namespace %s: %s", namespace, e)
                 raise
 
     def create_ingress(
@@ -333,15 +450,15 @@ class KubernetesClient:
                 namespace=namespace,
                 body=ingress
             )
-            logger.info(f"Created Ingress {name} in namespace {namespace}")
+            logger.info("Created Ingress %s in namespace %s", name, namespace)
             # Return the URL (for localhost, we'll use the NodePort)
             return f"http://{ingress_host}{ingress_path}"
         except ApiException as e:
             if e.status == 409:  # Already exists
-                logger.info(f"Ingress {name} in namespace {namespace} already exists")
+                logger.info("Ingress %s in namespace %s already exists", name, namespace)
                 return f"http://{ingress_host}{ingress_path}"
             else:
-                logger.error(f"Failed to create Ingress {name}: {str(e)}")
+                logger.error("Failed to create Ingress %s: %s", name, e)
                 raise
 
     def delete_ingress(self, namespace: str, name: str) -> None:
@@ -360,11 +477,78 @@ class KubernetesClient:
                 name=name,
                 namespace=namespace
             )
-            logger.info(f"Deleted Ingress {name} from namespace {namespace}")
+            logger.info("Deleted Ingress %s from namespace %s", name, namespace)
         except ApiException as e:
             if e.status == 404:
-                logger.info(f"Ingress {name} in namespace {namespace} does not exist")
+                logger.info("Ingress %s in namespace %s does not exist", name, namespace)
             else:
-                logger.error(f"Failed to delete Ingress {name}: {str(e)}")
+                logger.error("Failed to delete Ingress %s: %s", name, e)
                 raise
 
+    def get_release_deployment_status(
+        self,
+        namespace: str,
+        release_name: str
+    ) -> Optional[Dict[str, int]]:
+        """
+        Get replica counts for the Deployment created by a Helm release.
+        The Deployment is found by the chart's app.kubernetes.io/instance
+        label, so no Helm invocation is needed.
+
+        Args:
+            namespace: Namespace name
+            release_name: Helm release name
+
+        Returns:
+            Dictionary with "replicas", "ready_replicas" and
+            "available_replicas", or None if the release has no Deployment
+
+        Raises:
+            ApiException: If the lookup fails
+        """
+        deployments = self.apps_v1.list_namespaced_deployment(
+            namespace=namespace,
+            label_selector=f"app.kubernetes.io/instance={release_name}"
+        )
+        if not deployments.items:
+            return None
+
+        deployment = deployments.items[0]
+        status = deployment.status
+        return {
+            "replicas": deployment.spec.replicas or 0,
+            "ready_replicas": status.ready_replicas or 0,
+            "available_replicas": status.available_replicas or 0,
+        }
+
+
+_shared_client: Optional[KubernetesClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_kubernetes_client() -> KubernetesClient:
+    """
+    Get the process-wide Kubernetes client.
+
+    The kubeconfig is parsed and the API clients (with their HTTPS
+    connection pools) are built once, on first use.
+
+    Returns:
+        Shared KubernetesClient instance
+
+    Raises:
+        Exception: If the Kubernetes configuration cannot be loaded
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = KubernetesClient()
+    return _shared_client
+
+
+def reset_kubernetes_client() -> None:
+    """Drop the shared Kubernetes client so the next use rebuilds it."""
+    global _shared_client
+    with _shared_client_lock:
+        _shared_client = None
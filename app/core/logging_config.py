@@ -0,0 +1,63 @@
+"""
+Logging configuration.
+Supports plain text output and one-JSON-object-per-line output for log ingestion.
+"""
+
+import logging
+from datetime import datetime, timezone
+
+import orjson
+
+# LogRecord attributes that are part of every record; anything else was passed
+# through ``extra=`` and is emitted as a structured field
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Render a record as JSON.
+
+        Args:
+            record: Log record
+
+        Returns:
+            JSON document for the record
+        """
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text") -> None:
+    """
+    Configure the root logger for the application.
+
+    Args:
+        level: Minimum log level name (e.g. "INFO", "DEBUG")
+        fmt: "json" for structured output, anything else for plain text
+    """
+    handler = logging.StreamHandler()
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level.upper())
@@ -2,12 +2,19 @@
 Security utilities for password hashing and JWT token management.
 """
 
+import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 
 from app.config import settings
+from app.core.cache import TTLCache
+
+# Decoded claims keyed by raw token, so repeat requests skip signature checks.
+# Entries never outlive the token's own "exp" claim.
+_JWT_CACHE = TTLCache(maxsize=10_000, ttl=60)
 
 # Use bcrypt directly to avoid passlib compatibility issues with newer bcrypt versions
 # This is a workaround for passlib's incompatibility with bcrypt 5.x
@@ -41,12 +48,44 @@ def get_password_hash(password: str) -> str:
     Returns:
         The hashed password
     """
-    # Use bcrypt directly with salt rounds
-    salt = bcrypt.gensalt()
+    # Use bcrypt directly with salt rounds. Existing hashes keep the cost they
+    # were created with, so changing BCRYPT_ROUNDS only affects new hashes.
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password from async code.
+
+    bcrypt spends tens of milliseconds of CPU per check and releases the GIL
+    while doing so, so the check runs in a worker thread and the event loop
+    keeps serving other requests.
+
+    Args:
+        plain_password: The plain text password
+        hashed_password: The hashed password to verify against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password from async code, in a worker thread (see verify_password_async).
+
+    Args:
+        password: The plain text password to hash
+
+    Returns:
+        The hashed password
+    """
+    return await asyncio.to_thread(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -83,9 +122,39 @@ def decode_access_token(token: str) -> dict:
     Raises:
         JWTError: If token is invalid or expired
     """
+    payload = _JWT_CACHE.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return payload
     except JWTError:
         raise JWTError("Invalid token")
 
+    exp = payload.get("exp")
+    ttl = _JWT_CACHE.ttl if exp is None else min(_JWT_CACHE.ttl, exp - time.time())
+    if ttl > 0:
+        _JWT_CACHE.set(token, payload, ttl)
+    return payload
+
+
+async def decode_access_token_async(token: str) -> dict:
+    """
+    Decode and verify a JWT access token from async code.
+
+    HMAC (HS*) verification is cheap and runs inline. Asymmetric algorithms
+    (RS*, ES*, PS*) cost around a millisecond of CPU per verify, so they are
+    moved to a worker thread to keep the event loop free.
+
+    Args:
+        token: The JWT token string to decode
+
+    Returns:
+        Dictionary containing the decoded token payload
+
+    Raises:
+        JWTError: If token is invalid or expired
+    """
+    if settings.JWT_ALGORITHM.startswith("HS"):
+        return decode_access_token(token)
+    return await asyncio.to_thread(decode_access_token, token)
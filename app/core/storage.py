@@ -4,11 +4,26 @@ Handles connection and basic operations with Minio (S3-compatible storage).
 """
 
 from minio import Minio
+from minio.commonconfig import CopySource
 from minio.error import S3Error
-from typing import BinaryIO, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set
 import io
 
 from app.config import settings
+from app.core.cache import TTLCache
+
+# Multipart chunk size for streamed uploads (Minio minimum is 5 MiB)
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Chunk size for streamed downloads
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# How long an object existence lookup (positive or negative) is trusted
+EXISTS_CACHE_TTL = 15.0
+
+# Concurrent HEAD requests issued by exists_many
+EXISTS_MANY_WORKERS = 16
 
 
 class StorageClient:
@@ -17,6 +32,9 @@ class StorageClient:
     Handles bucket creation and file uploads.
     """
 
+    # Buckets already verified by this process; the check runs once per bucket
+    _checked_buckets: Set[str] = set()
+
     def __init__(self):
         """Initialize Minio client with settings."""
         self.client = Minio(
@@ -26,18 +44,24 @@ class StorageClient:
             secure=settings.MINIO_USE_SSL,
         )
         self.bucket_name = settings.MINIO_BUCKET_NAME
+        # Object name -> exists, for both hits and misses
+        self._exists_cache = TTLCache(maxsize=4096, ttl=EXISTS_CACHE_TTL)
         self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self) -> None:
         """
         Ensure the bucket exists, create it if it doesn't.
+        Skipped once the bucket has been verified by this process.
 
         Raises:
             S3Error: If bucket creation fails
         """
+        if self.bucket_name in StorageClient._checked_buckets:
+            return
         try:
             if not self.client.bucket_exists(self.bucket_name):
                 self.client.make_bucket(self.bucket_name)
+            StorageClient._checked_buckets.add(self.bucket_name)
         except S3Error as e:
             # Re-raise with more context
             raise S3Error(
@@ -53,6 +77,7 @@ class StorageClient:
     ) -> str:
         """
         Upload a file to S3/Minio.
+        Thin wrapper around upload_stream for data already in memory.
 
         Args:
             object_name: S3 object key (path)
@@ -69,15 +94,53 @@ class StorageClient:
         if length is None:
             length = len(file_data)
 
+        return self.upload_stream(
+            object_name,
+            io.BytesIO(file_data),
+            length=length,
+            content_type=content_type,
+        )
+
+    def upload_stream(
+        self,
+        object_name: str,
+        stream: BinaryIO,
+        length: int = -1,
+        content_type: str = "application/octet-stream",
+        part_size: int = MULTIPART_PART_SIZE,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Upload a file-like object to S3/Minio without reading it into memory.
+
+        Large objects, and streams of unknown length (length=-1), are sent
+        as a multipart upload in part_size chunks.
+
+        Args:
+            object_name: S3 object key (path)
+            stream: Readable binary stream positioned at the start of the data
+            length: Number of bytes to upload, or -1 if unknown
+            content_type: MIME type of the file
+            part_size: Multipart chunk size in bytes
+            metadata: User metadata stored with the object (x-amz-meta-*)
+
+        Returns:
+            S3 path (s3://bucket/object_name)
+
+        Raises:
+            S3Error: If upload fails
+        """
         try:
-            file_obj = io.BytesIO(file_data)
             self.client.put_object(
                 self.bucket_name,
                 object_name,
-                file_obj,
+                stream,
                 length=length,
                 content_type=content_type,
+                part_size=part_size,
+                metadata=metadata,
             )
+            self._exists_cache.set(object_name, True)
             return f"s3://{self.bucket_name}/{object_name}"
         except S3Error as e:
             # Re-raise the original S3Error with additional context in message
@@ -91,35 +154,137 @@ class StorageClient:
                 response=getattr(e, 'response', None)
             ) from e
 
-    def get_file(self, object_name: str) -> bytes:
+    def copy_file(self, source_object_name: str, object_name: str) -> str:
         """
-        Download a file from S3/Minio.
+        Copy an object within the bucket server-side, without moving its bytes
+        through this process.
 
         Args:
-            object_name: S3 object key (path)
+            source_object_name: S3 object key to copy from
+            object_name: S3 object key to copy to
 
         Returns:
-            File content as bytes
+            S3 path (s3://bucket/object_name)
 
         Raises:
-            S3Error: If download fails
+            S3Error: If the copy fails
         """
         try:
-            response = self.client.get_object(self.bucket_name, object_name)
-            return response.read()
+            self.client.copy_object(
+                self.bucket_name,
+                object_name,
+                CopySource(self.bucket_name, source_object_name),
+            )
+            self._exists_cache.set(object_name, True)
+            return f"s3://{self.bucket_name}/{object_name}"
         except S3Error as e:
-            # Re-raise the original S3Error with additional context
             raise S3Error(
-                code=getattr(e, 'code', 'GetError'),
-                message=f"Failed to get file '{object_name}': {getattr(e, 'message', str(e))}",
+                code=getattr(e, 'code', 'CopyError'),
+                message=f"Failed to copy '{source_object_name}' to '{object_name}': {getattr(e, 'message', str(e))}",
                 resource=getattr(e, 'resource', object_name),
                 request_id=getattr(e, 'request_id', None),
                 host_id=getattr(e, 'host_id', None),
                 response=getattr(e, 'response', None)
             ) from e
+
+    def get_metadata(self, object_name: str, key: str) -> Optional[str]:
+        """
+        Read one user metadata value of an object.
+
+        Args:
+            object_name: S3 object key (path)
+            key: Metadata key as passed to upload_stream (without x-amz-meta-)
+
+        Returns:
+            The value, None if the object does not exist or has no such key
+
+        Raises:
+            S3Error: If the lookup fails for a reason other than a missing key
+        """
+        try:
+            stat = self.client.stat_object(self.bucket_name, object_name)
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise
+            return None
+        if stat.metadata is None:
+            return None
+        return stat.metadata.get(f"x-amz-meta-{key}")
+
+    def get_file_bytes(self, object_name: str) -> bytes:
+        """
+        Download a file from S3/Minio into memory.
+
+        Args:
+            object_name: S3 object key (path)
+
+        Returns:
+            File content as bytes
+
+        Raises:
+            S3Error: If download fails
+        """
+        response = None
+        try:
+            response = self.client.get_object(self.bucket_name, object_name)
+            return response.read()
+        except S3Error as e:
+            raise self._get_error(e, object_name) from e
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
+    def get_file_stream(
+        self, object_name: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Download a file from S3/Minio as a stream of chunks.
+
+        Only one chunk is held in memory at a time, so large model artifacts
+        can be written to disk or forwarded without a full in-memory copy.
+
+        Args:
+            object_name: S3 object key (path)
+            chunk_size: Size of each chunk in bytes
+
+        Yields:
+            File content chunks
+
+        Raises:
+            S3Error: If download fails
+        """
+        response = None
+        try:
+            response = self.client.get_object(self.bucket_name, object_name)
+            yield from response.stream(amt=chunk_size)
+        except S3Error as e:
+            raise self._get_error(e, object_name) from e
         finally:
-            response.close()
-            response.release_conn()
+            if response is not None:
+                response.close()
+                response.release_conn()
+
+    @staticmethod
+    def _get_error(e: S3Error, object_name: str) -> S3Error:
+        """
+        Build an S3Error for a failed download with additional context.
+
+        Args:
+            e: Original error
+            object_name: S3 object key (path)
+
+        Returns:
+            S3Error preserving the original error details
+        """
+        return S3Error(
+            code=getattr(e, 'code', 'GetError'),
+            message=f"Failed to get file '{object_name}': {getattr(e, 'message', str(e))}",
+            resource=getattr(e, 'resource', object_name),
+            request_id=getattr(e, 'request_id', None),
+            host_id=getattr(e, 'host_id', None),
+            response=getattr(e, 'response', None)
+        )
 
     def delete_file(self, object_name: str) -> None:
         """
@@ -131,6 +296,7 @@ class StorageClient:
         Raises:
             S3Error: If deletion fails
         """
+        self._exists_cache.pop(object_name)
         try:
             self.client.remove_object(self.bucket_name, object_name)
         except S3Error as e:
@@ -147,16 +313,48 @@ class StorageClient:
     def file_exists(self, object_name: str) -> bool:
         """
         Check if a file exists in S3/Minio.
+        Results, including misses, are cached for a short TTL.
 
         Args:
             object_name: S3 object key (path)
 
         Returns:
-            True if file exists, False otherwise
+            True if file exists, False otherwise (including when the check
+            itself fails; such results are not cached)
         """
+        cached = self._exists_cache.get(object_name)
+        if cached is not None:
+            return cached
+
         try:
             self.client.stat_object(self.bucket_name, object_name)
-            return True
-        except S3Error:
-            return False
+            exists = True
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                # Transient failure: report a miss without remembering it
+                return False
+            exists = False
+        self._exists_cache.set(object_name, exists)
+        return exists
+
+    def exists_many(
+        self, object_names: List[str], max_workers: int = EXISTS_MANY_WORKERS
+    ) -> Dict[str, bool]:
+        """
+        Check existence of several files, issuing the lookups concurrently.
+
+        Args:
+            object_names: S3 object keys (paths)
+            max_workers: Maximum number of lookups in flight at once
+
+        Returns:
+            Mapping of object name to whether it exists (see file_exists)
+        """
+        unique_names = list(dict.fromkeys(object_names))
+        if not unique_names:
+            return {}
 
+        workers = min(max_workers, len(unique_names))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(self.file_exists, unique_names)
+            return dict(zip(unique_names, results))
@@ -7,19 +7,56 @@ from sqlalchemy.orm import declarative_base
 
 from app.config import settings
 
-# Create async engine
+
+def _async_database_url(url: str) -> str:
+    """
+    Ensure a plain PostgreSQL URL uses the asyncpg driver.
+
+    Args:
+        url: Database URL from settings
+
+    Returns:
+        URL with the asyncpg driver selected
+    """
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _connect_args(url: str) -> dict:
+    """
+    Driver-specific connection arguments.
+
+    Args:
+        url: URL with the async driver selected
+
+    Returns:
+        Keyword arguments passed to the driver's connect()
+    """
+    if url.startswith("postgresql+asyncpg://"):
+        # Per-connection LRU of prepared statements for the repositories' point queries
+        return {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return {}
+
+
+DATABASE_URL = _async_database_url(settings.DATABASE_URL)
+
+# Create async engine (one per process; every session shares its pool)
 engine = create_async_engine(
-    settings.DATABASE_URL,
+    DATABASE_URL,
     echo=settings.DATABASE_ECHO,
     future=True,
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args=_connect_args(DATABASE_URL),
 )
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
-    engine,
+    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -34,12 +71,19 @@ async def get_db() -> AsyncSession:
     """
     Dependency function to get database session.
     Used in FastAPI route dependencies.
+
+    FastAPI caches dependencies per request, so every dependency and route
+    that asks for get_db within one request shares this single session.
+    Any transaction left open by a failed request is rolled back before
+    the connection goes back to the pool.
     """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-        finally:
-            await session.close()
+        except Exception:
+            if session.in_transaction():
+                await session.rollback()
+            raise
 
 
 async def init_db() -> None:
@@ -2,15 +2,23 @@
 FastAPI application entry point.
 """
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
+from app.core.kubernetes_client import reset_kubernetes_client
+from app.core.logging_config import configure_logging
 from app.database import close_db, init_db
+from app.services.storage_service import StorageService
 from app.api.v1 import router as api_v1_router
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,9 +26,20 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for startup and shutdown events.
     """
     # Startup
+    configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+    # init_db also opens the first pooled DB connection
     await init_db()
+    # Connect to Minio up front so the first upload doesn't pay for it.
+    # If Minio is unavailable, get_storage retries lazily on first use.
+    try:
+        app.state.storage = await asyncio.to_thread(StorageService)
+    except Exception as e:
+        logger.warning("Minio warm-up failed, deferring to first request: %s", e)
+        app.state.storage = None
     yield
     # Shutdown
+    app.state.storage = None
+    reset_kubernetes_client()
     await close_db()
 
 
@@ -30,6 +49,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -1,9 +1,14 @@
 """
 Model registry database models.
+
+Relationships are declared with lazy="raise_on_sql" so an implicit lazy load
+fails loudly instead of issuing one query per row. Queries that need related
+rows load them explicitly, e.g.
+select(Model).options(selectinload(Model.versions).selectinload(ModelVersion.deployments)).
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, CheckConstraint, Index
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 
@@ -23,54 +28,121 @@ class ModelVersionStatus(str, enum.Enum):
     FAILED = "Failed"
 
 
+def _enum_values(enum_cls: type[enum.Enum]) -> list[str]:
+    """Persist enum values (e.g. "sklearn") rather than member names."""
+    return [member.value for member in enum_cls]
+
+
 class Model(Base):
     """Model metadata model representing a user's ML model."""
 
     __tablename__ = "models"
+    # Fetch server-generated timestamps with RETURNING during flush
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        CheckConstraint("type IN ('sklearn', 'pytorch')", name="ck_models_type"),
+        Index("ix_models_user_id_id", "user_id", "id"),
+        Index("ix_models_user_id_name", "user_id", "name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
-    type = Column(Enum(ModelType), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    type = Column(
+        Enum(
+            ModelType,
+            native_enum=False,
+            length=16,
+            validate_strings=True,
+            values_callable=_enum_values,
+        ),
+        nullable=False,
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
     # Relationships
-    user = relationship("User", back_populates="models")
-    versions = relationship("ModelVersion", back_populates="model", cascade="all, delete-orphan")
+    user = relationship("User", back_populates="models", lazy="raise_on_sql")
+    versions = relationship(
+        "ModelVersion",
+        back_populates="model",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
 
 
 class ModelVersion(Base):
     """Model version model representing a specific version of a model."""
 
     __tablename__ = "model_versions"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('Building', 'Ready', 'Failed')", name="ck_model_versions_status"
+        ),
+        Index("ix_model_versions_model_id_id", "model_id", "id"),
+        Index(
+            "ix_model_versions_model_id_version_tag", "model_id", "version_tag", unique=True
+        ),
+        Index("ix_model_versions_sha256", "sha256"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    model_id = Column(Integer, ForeignKey("models.id", ondelete="CASCADE"), nullable=False, index=True)
+    model_id = Column(Integer, ForeignKey("models.id", ondelete="CASCADE"), nullable=False)
     version_tag = Column(String, nullable=False)  # e.g., "v1", "v2", "latest"
     s3_path = Column(String, nullable=False)  # Path to model artifact in S3
-    status = Column(Enum(ModelVersionStatus), default=ModelVersionStatus.BUILDING, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    sha256 = Column(String(64), nullable=True)  # Hex digest of the uploaded model file
+    status = Column(
+        Enum(
+            ModelVersionStatus,
+            native_enum=False,
+            length=16,
+            validate_strings=True,
+            values_callable=_enum_values,
+        ),
+        default=ModelVersionStatus.BUILDING,
+        nullable=False,
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
     # Relationships
-    model = relationship("Model", back_populates="versions")
-    deployments = relationship("Deployment", back_populates="model_version", cascade="all, delete-orphan")
+    model = relationship("Model", back_populates="versions", lazy="raise_on_sql")
+    deployments = relationship(
+        "Deployment",
+        back_populates="model_version",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
 
 
 class Deployment(Base):
     """Deployment model representing a deployed model version."""
 
     __tablename__ = "deployments"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_deployments_version_id_id", "version_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    version_id = Column(Integer, ForeignKey("model_versions.id", ondelete="CASCADE"), nullable=False, index=True)
+    version_id = Column(Integer, ForeignKey("model_versions.id", ondelete="CASCADE"), nullable=False)
     k8s_service_name = Column(String, nullable=False, unique=True)  # Kubernetes service name
     url = Column(String, nullable=True)  # Public URL for the deployment
     replicas = Column(Integer, default=1, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
     # Relationships
-    model_version = relationship("ModelVersion", back_populates="deployments")
+    model_version = relationship(
+        "ModelVersion", back_populates="deployments", lazy="raise_on_sql"
+    )
 
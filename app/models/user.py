@@ -2,8 +2,8 @@
 User database model.
 """
 
-from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 
@@ -20,14 +20,24 @@ class User(Base):
     """User model representing a platform user."""
 
     __tablename__ = "users"
+    # Fetch server-generated timestamps with RETURNING during flush
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
 
     # Relationships
-    models = relationship("Model", back_populates="user", cascade="all, delete-orphan")
+    models = relationship(
+        "Model",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
 
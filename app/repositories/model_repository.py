@@ -1,16 +1,119 @@
 """
 Model repository for database operations.
 Handles all database queries related to models, model versions, and deployments.
+
+Write methods only flush; the calling service commits once per logical
+operation. The *_lite read methods select plain columns and skip ORM
+hydration; use them for read-only paths and the ORM variants for mutations.
 """
 
-from typing import Optional, List
+import itertools
+import secrets
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import RowMapping, bindparam, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import selectinload
 
 from app.models.model import Model, ModelVersion, Deployment, ModelVersionStatus
 from app.schemas.model import ModelCreate, ModelVersionCreate, DeploymentCreate
 
+# Kubernetes service names are "model-<version>-<tag>-<seq>": the tag is fixed at
+# startup (epoch seconds plus random hex) and the sequence counts up per process
+_SERVICE_NAME_TAG = f"{int(time.time())}-{secrets.token_hex(3)}"
+_SERVICE_NAME_SEQ = itertools.count()
+
+# Columns returned by the lite model reads (the fields of ModelResponse)
+_MODEL_COLUMNS = (
+    Model.id,
+    Model.name,
+    Model.type,
+    Model.user_id,
+    Model.created_at,
+    Model.updated_at,
+)
+
+# Read statements are built once at import and executed with bound parameters.
+# Paginated reads apply offset/limit per call on top of the shared base.
+_MODELS_BY_USER = (
+    select(Model).where(Model.user_id == bindparam("user_id")).order_by(Model.id)
+)
+_MODEL_ROW_BY_ID = select(*_MODEL_COLUMNS).where(
+    Model.id == bindparam("model_id"), Model.user_id == bindparam("user_id")
+)
+_MODEL_ROWS_BY_USER = (
+    select(*_MODEL_COLUMNS).where(Model.user_id == bindparam("user_id")).order_by(Model.id)
+)
+# Session.info key holding version ID -> owning user ID. Ownership never changes,
+# so repeated checks for the same version within one request (one session) are
+# answered from here and the identity map instead of another query.
+_VERSION_OWNERS = "version_owners"
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+_VERSION_WITH_MODEL = (
+    select(ModelVersion, Model)
+    .join(Model, ModelVersion.model_id == Model.id)
+    .where(ModelVersion.id == bindparam("version_id"), Model.user_id == bindparam("user_id"))
+)
+_VERSION_WITH_OWNER = (
+    select(ModelVersion, Model.user_id)
+    .join(Model, ModelVersion.model_id == Model.id)
+    .where(ModelVersion.id == bindparam("version_id"))
+)
+_VERSIONS_BY_MODEL = (
+    select(ModelVersion)
+    .where(ModelVersion.model_id == bindparam("model_id"))
+    .order_by(ModelVersion.id)
+)
+_VERSIONS_BY_MODEL_FOR_USER = (
+    select(ModelVersion)
+    .join(Model, ModelVersion.model_id == Model.id)
+    .where(
+        ModelVersion.model_id == bindparam("model_id"), Model.user_id == bindparam("user_id")
+    )
+    .order_by(ModelVersion.id)
+)
+_VERSION_BY_MODEL_AND_TAG = select(ModelVersion).where(
+    ModelVersion.model_id == bindparam("model_id"),
+    ModelVersion.version_tag == bindparam("version_tag"),
+)
+_S3_PATH_BY_SHA256_FOR_USER = (
+    select(ModelVersion.s3_path)
+    .join(Model, ModelVersion.model_id == Model.id)
+    .where(ModelVersion.sha256 == bindparam("sha256"), Model.user_id == bindparam("user_id"))
+    .limit(1)
+)
+_DEPLOYMENT_WITH_OWNER = (
+    select(Deployment, Model.user_id)
+    .join(ModelVersion, Deployment.version_id == ModelVersion.id)
+    .join(Model, ModelVersion.model_id == Model.id)
+    .where(Deployment.id == bindparam("deployment_id"))
+)
+_DEPLOYMENTS_BY_VERSION = (
+    select(Deployment)
+    .where(Deployment.version_id == bindparam("version_id"))
+    .order_by(Deployment.id)
+)
+_DEPLOYMENTS_BY_VERSION_FOR_USER = (
+    select(Deployment)
+    .join(ModelVersion, Deployment.version_id == ModelVersion.id)
+    .join(Model, ModelVersion.model_id == Model.id)
+    .where(
+        Deployment.version_id == bindparam("version_id"), Model.user_id == bindparam("user_id")
+    )
+    .order_by(Deployment.id)
+)
+_DEPLOYMENT_BY_SERVICE_NAME = select(Deployment).where(
+    Deployment.k8s_service_name == bindparam("k8s_service_name")
+)
+_DEPLOYMENTS_BY_SERVICE_NAMES = select(Deployment).where(
+    Deployment.k8s_service_name.in_(bindparam("k8s_service_names", expanding=True))
+)
+
 
 class ModelRepository:
     """Repository for model data access operations."""
@@ -27,6 +130,7 @@ class ModelRepository:
     async def get_by_id(self, model_id: int, user_id: int) -> Optional[Model]:
         """
         Get a model by ID, ensuring it belongs to the user.
+        Served from the session's identity map when the model is already loaded.
 
         Args:
             model_id: The model ID
@@ -35,23 +139,70 @@ class ModelRepository:
         Returns:
             Model object if found and owned by user, None otherwise
         """
+        model = await self.db.get(Model, model_id)
+        if model is None or model.user_id != user_id:
+            return None
+        return model
+
+    async def get_all_by_user(
+        self, user_id: int, offset: int = 0, limit: Optional[int] = None
+    ) -> Sequence[Model]:
+        """
+        Get a page of models for a user, ordered by ID.
+
+        Args:
+            user_id: The user ID
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return (None for all)
+
+        Returns:
+            Sequence of Model objects
+        """
+        result = await self.db.scalars(
+            _MODELS_BY_USER.offset(offset).limit(limit), {"user_id": user_id}
+        )
+        return result.all()
+
+    async def get_by_id_lite(self, model_id: int, user_id: int) -> Optional[RowMapping]:
+        """
+        Get a model's columns by ID without loading an ORM object.
+
+        Args:
+            model_id: The model ID
+            user_id: The user ID (for ownership verification)
+
+        Returns:
+            Row mapping of the model's columns if found and owned by user, None otherwise
+        """
         result = await self.db.execute(
-            select(Model).where(Model.id == model_id, Model.user_id == user_id)
+            _MODEL_ROW_BY_ID, {"model_id": model_id, "user_id": user_id}
         )
-        return result.scalar_one_or_none()
+        return result.mappings().one_or_none()
 
-    async def get_all_by_user(self, user_id: int) -> List[Model]:
+    async def get_all_by_user_lite(
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> Sequence[RowMapping]:
         """
-        Get all models for a user.
+        Get a page of a user's models as plain rows, ordered by ID.
 
         Args:
             user_id: The user ID
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return (None for all)
+            after_id: Keyset cursor; only models with a larger ID are returned
 
         Returns:
-            List of Model objects
+            Row mappings of the models' columns
         """
-        result = await self.db.execute(select(Model).where(Model.user_id == user_id))
-        return list(result.scalars().all())
+        stmt = _MODEL_ROWS_BY_USER
+        if after_id is not None:
+            stmt = stmt.where(Model.id > after_id)
+        result = await self.db.execute(stmt.offset(offset).limit(limit), {"user_id": user_id})
+        return result.mappings().all()
 
     async def create(self, model_data: ModelCreate, user_id: int) -> Model:
         """
@@ -70,8 +221,7 @@ class ModelRepository:
             user_id=user_id,
         )
         self.db.add(model)
-        await self.db.commit()
-        await self.db.refresh(model)
+        await self.db.flush()
         return model
 
     async def update(self, model: Model) -> Model:
@@ -84,8 +234,7 @@ class ModelRepository:
         Returns:
             Updated Model object
         """
-        await self.db.commit()
-        await self.db.refresh(model)
+        await self.db.flush()
         return model
 
     async def delete(self, model: Model) -> None:
@@ -96,7 +245,28 @@ class ModelRepository:
             model: Model object to delete
         """
         await self.db.delete(model)
-        await self.db.commit()
+        await self.db.flush()
+
+    async def delete_by_id(self, model_id: int, user_id: int) -> bool:
+        """
+        Delete a model with a single DELETE statement, ensuring ownership.
+
+        Versions and deployments are removed by the database through
+        ON DELETE CASCADE instead of being loaded into the session.
+
+        Args:
+            model_id: The model ID
+            user_id: The user ID (for ownership verification)
+
+        Returns:
+            True if a model was deleted, False otherwise
+        """
+        result = await self.db.execute(
+            delete(Model).where(Model.id == model_id, Model.user_id == user_id)
+        )
+        # The model's versions are gone too
+        self.db.info.pop(_VERSION_OWNERS, None)
+        return result.rowcount > 0
 
 
 class ModelVersionRepository:
@@ -114,6 +284,7 @@ class ModelVersionRepository:
     async def get_by_id(self, version_id: int) -> Optional[ModelVersion]:
         """
         Get a model version by ID.
+        Served from the session's identity map when the version is already loaded.
 
         Args:
             version_id: The version ID
@@ -121,25 +292,117 @@ class ModelVersionRepository:
         Returns:
             ModelVersion object if found, None otherwise
         """
+        return await self.db.get(ModelVersion, version_id)
+
+    async def get_by_id_with_model(
+        self, version_id: int, user_id: int
+    ) -> Optional[Tuple[ModelVersion, Model]]:
+        """
+        Get a model version and its parent model in a single query,
+        ensuring the model belongs to the user.
+
+        Args:
+            version_id: The version ID
+            user_id: The user ID (for ownership verification)
+
+        Returns:
+            (ModelVersion, Model) tuple if found and owned by user, None otherwise
+        """
+        owners = self.db.info.setdefault(_VERSION_OWNERS, {})
+        owner_id = owners.get(version_id)
+        if owner_id is not None:
+            if owner_id != user_id:
+                return None
+            version = await self.db.get(ModelVersion, version_id)
+            model = await self.db.get(Model, version.model_id) if version else None
+            if model is not None:
+                return version, model
+
         result = await self.db.execute(
-            select(ModelVersion).where(ModelVersion.id == version_id)
+            _VERSION_WITH_MODEL, {"version_id": version_id, "user_id": user_id}
         )
-        return result.scalar_one_or_none()
+        row = result.one_or_none()
+        if row is None:
+            return None
+        owners[version_id] = user_id
+        return tuple(row)
+
+    async def get_by_id_with_owner(
+        self, version_id: int
+    ) -> Optional[Tuple[ModelVersion, int]]:
+        """
+        Get a model version and the ID of the user owning its model in a
+        single query. Repeat calls in the same session reuse the first result.
+
+        Args:
+            version_id: The version ID
+
+        Returns:
+            (ModelVersion, owner user ID) tuple if found, None otherwise
+        """
+        owners = self.db.info.setdefault(_VERSION_OWNERS, {})
+        owner_id = owners.get(version_id)
+        if owner_id is not None:
+            version = await self.db.get(ModelVersion, version_id)
+            if version is not None:
+                return version, owner_id
+
+        result = await self.db.execute(_VERSION_WITH_OWNER, {"version_id": version_id})
+        row = result.one_or_none()
+        if row is None:
+            return None
+        owners[version_id] = row[1]
+        return tuple(row)
 
-    async def get_by_model_id(self, model_id: int) -> List[ModelVersion]:
+    async def get_by_model_id(
+        self, model_id: int, offset: int = 0, limit: Optional[int] = None
+    ) -> Sequence[ModelVersion]:
         """
-        Get all versions for a model.
+        Get a page of versions for a model, ordered by ID.
 
         Args:
             model_id: The model ID
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return (None for all)
 
         Returns:
-            List of ModelVersion objects
+            Sequence of ModelVersion objects
         """
-        result = await self.db.execute(
-            select(ModelVersion).where(ModelVersion.model_id == model_id)
+        result = await self.db.scalars(
+            _VERSIONS_BY_MODEL.offset(offset).limit(limit), {"model_id": model_id}
         )
-        return list(result.scalars().all())
+        return result.all()
+
+    async def get_by_model_id_for_user(
+        self,
+        model_id: int,
+        user_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> Sequence[ModelVersion]:
+        """
+        Get a page of versions for a model owned by the user, ordered by ID.
+        Ownership is enforced in the same query through a join on the model.
+
+        Args:
+            model_id: The model ID
+            user_id: The user ID (for ownership verification)
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return (None for all)
+            after_id: Keyset cursor; only versions with a larger ID are returned
+
+        Returns:
+            Sequence of ModelVersion objects (empty if the model is missing or not owned)
+        """
+        stmt = _VERSIONS_BY_MODEL_FOR_USER
+        if after_id is not None:
+            stmt = stmt.where(ModelVersion.id > after_id)
+        result = await self.db.scalars(
+            stmt.offset(offset).limit(limit),
+            {"model_id": model_id, "user_id": user_id},
+        )
+        return result.all()
 
     async def get_by_model_and_tag(
         self, model_id: int, version_tag: str
@@ -154,34 +417,80 @@ class ModelVersionRepository:
         Returns:
             ModelVersion object if found, None otherwise
         """
-        result = await self.db.execute(
-            select(ModelVersion).where(
-                ModelVersion.model_id == model_id,
-                ModelVersion.version_tag == version_tag,
-            )
+        return await self.db.scalar(
+            _VERSION_BY_MODEL_AND_TAG, {"model_id": model_id, "version_tag": version_tag}
         )
-        return result.scalar_one_or_none()
 
-    async def create(self, version_data: ModelVersionCreate) -> ModelVersion:
+    async def get_s3_path_by_sha256(self, sha256: str, user_id: int) -> Optional[str]:
         """
-        Create a new model version.
+        Find a stored model artifact of the user's with the given content digest.
+
+        Args:
+            sha256: Hex SHA-256 digest of the model file
+            user_id: The user ID (only the user's own artifacts are considered)
+
+        Returns:
+            S3 path of a version's model file with that digest, None if there is none
+        """
+        return await self.db.scalar(
+            _S3_PATH_BY_SHA256_FOR_USER, {"sha256": sha256, "user_id": user_id}
+        )
+
+    async def create(self, version_data: ModelVersionCreate) -> Optional[ModelVersion]:
+        """
+        Create a new model version unless the model already has its tag.
+
+        The duplicate check and the insert are one INSERT ... ON CONFLICT DO
+        NOTHING RETURNING statement against the (model_id, version_tag) unique
+        index, so concurrent creates cannot both succeed.
 
         Args:
             version_data: Model version creation data
 
         Returns:
-            Created ModelVersion object
+            Created ModelVersion object, or None if the version tag already exists
+        """
+        dialect_insert = _UPSERT_INSERTS[self.db.get_bind().dialect.name]
+        stmt = (
+            dialect_insert(ModelVersion)
+            .values(
+                model_id=version_data.model_id,
+                version_tag=version_data.version_tag,
+                s3_path=version_data.s3_path,
+                status=ModelVersionStatus.BUILDING,
+            )
+            .on_conflict_do_nothing(index_elements=["model_id", "version_tag"])
+            .returning(ModelVersion)
+        )
+        return await self.db.scalar(stmt)
+
+    async def create_many(
+        self, versions_data: Sequence[ModelVersionCreate]
+    ) -> Sequence[ModelVersion]:
         """
-        version = ModelVersion(
-            model_id=version_data.model_id,
-            version_tag=version_data.version_tag,
-            s3_path=version_data.s3_path,
-            status=ModelVersionStatus.BUILDING,
+        Create several model versions with one multi-row INSERT ... RETURNING.
+
+        Args:
+            versions_data: Model version creation data
+
+        Returns:
+            Created ModelVersion objects, in input order
+        """
+        if not versions_data:
+            return []
+        result = await self.db.scalars(
+            insert(ModelVersion).returning(ModelVersion, sort_by_parameter_order=True),
+            [
+                {
+                    "model_id": version_data.model_id,
+                    "version_tag": version_data.version_tag,
+                    "s3_path": version_data.s3_path,
+                    "status": ModelVersionStatus.BUILDING,
+                }
+                for version_data in versions_data
+            ],
         )
-        self.db.add(version)
-        await self.db.commit()
-        await self.db.refresh(version)
-        return version
+        return result.all()
 
     async def update(self, version: ModelVersion) -> ModelVersion:
         """
@@ -193,8 +502,7 @@ class ModelVersionRepository:
         Returns:
             Updated ModelVersion object
         """
-        await self.db.commit()
-        await self.db.refresh(version)
+        await self.db.flush()
         return version
 
 
@@ -213,6 +521,7 @@ class DeploymentRepository:
     async def get_by_id(self, deployment_id: int) -> Optional[Deployment]:
         """
         Get a deployment by ID.
+        Served from the session's identity map when the deployment is already loaded.
 
         Args:
             deployment_id: The deployment ID
@@ -220,25 +529,67 @@ class DeploymentRepository:
         Returns:
             Deployment object if found, None otherwise
         """
+        return await self.db.get(Deployment, deployment_id)
+
+    async def get_by_id_with_owner(
+        self, deployment_id: int
+    ) -> Optional[Tuple[Deployment, int]]:
+        """
+        Get a deployment and the ID of the user owning its model in a
+        single query.
+
+        Args:
+            deployment_id: The deployment ID
+
+        Returns:
+            (Deployment, owner user ID) tuple if found, None otherwise
+        """
         result = await self.db.execute(
-            select(Deployment).where(Deployment.id == deployment_id)
+            _DEPLOYMENT_WITH_OWNER, {"deployment_id": deployment_id}
         )
-        return result.scalar_one_or_none()
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
 
-    async def get_by_version_id(self, version_id: int) -> List[Deployment]:
+    async def get_by_version_id(
+        self, version_id: int, offset: int = 0, limit: Optional[int] = None
+    ) -> Sequence[Deployment]:
         """
-        Get all deployments for a model version.
+        Get a page of deployments for a model version, ordered by ID.
 
         Args:
             version_id: The version ID
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return (None for all)
 
         Returns:
-            List of Deployment objects
+            Sequence of Deployment objects
         """
-        result = await self.db.execute(
-            select(Deployment).where(Deployment.version_id == version_id)
+        result = await self.db.scalars(
+            _DEPLOYMENTS_BY_VERSION.offset(offset).limit(limit), {"version_id": version_id}
         )
-        return list(result.scalars().all())
+        return result.all()
+
+    async def get_by_version_id_for_user(
+        self, version_id: int, user_id: int, offset: int = 0, limit: Optional[int] = None
+    ) -> Sequence[Deployment]:
+        """
+        Get a page of deployments for a model version owned by the user, ordered by ID.
+        Ownership is enforced in the same query through joins up to the model.
+
+        Args:
+            version_id: The version ID
+            user_id: The user ID (for ownership verification)
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return (None for all)
+
+        Returns:
+            Sequence of Deployment objects (empty if the version is missing or not owned)
+        """
+        result = await self.db.scalars(
+            _DEPLOYMENTS_BY_VERSION_FOR_USER.offset(offset).limit(limit),
+            {"version_id": version_id, "user_id": user_id},
+        )
+        return result.all()
 
     async def get_by_k8s_service_name(
         self, k8s_service_name: str
@@ -252,10 +603,29 @@ class DeploymentRepository:
         Returns:
             Deployment object if found, None otherwise
         """
-        result = await self.db.execute(
-            select(Deployment).where(Deployment.k8s_service_name == k8s_service_name)
+        return await self.db.scalar(
+            _DEPLOYMENT_BY_SERVICE_NAME, {"k8s_service_name": k8s_service_name}
         )
-        return result.scalar_one_or_none()
+
+    async def get_by_k8s_service_names(
+        self, k8s_service_names: Iterable[str]
+    ) -> Dict[str, Deployment]:
+        """
+        Get the deployments for several Kubernetes service names in one query.
+
+        Args:
+            k8s_service_names: Kubernetes service names
+
+        Returns:
+            Mapping of service name to Deployment; names without a deployment are omitted
+        """
+        names = list(dict.fromkeys(k8s_service_names))
+        if not names:
+            return {}
+        result = await self.db.scalars(
+            _DEPLOYMENTS_BY_SERVICE_NAMES, {"k8s_service_names": names}
+        )
+        return {deployment.k8s_service_name: deployment for deployment in result}
 
     async def create(self, deployment_data: DeploymentCreate) -> Deployment:
         """
@@ -267,18 +637,18 @@ class DeploymentRepository:
         Returns:
             Created Deployment object
         """
-        import time
-        # Generate unique Kubernetes service name
-        k8s_service_name = f"model-{deployment_data.version_id}-{int(time.time())}"
-        
+        # Unique per process via the counter and across processes via the startup tag
+        k8s_service_name = (
+            f"model-{deployment_data.version_id}-{_SERVICE_NAME_TAG}-{next(_SERVICE_NAME_SEQ)}"
+        )
+
         deployment = Deployment(
             version_id=deployment_data.version_id,
             k8s_service_name=k8s_service_name,
             replicas=deployment_data.replicas,
         )
         self.db.add(deployment)
-        await self.db.commit()
-        await self.db.refresh(deployment)
+        await self.db.flush()
         return deployment
 
     async def update(self, deployment: Deployment) -> Deployment:
@@ -291,8 +661,7 @@ class DeploymentRepository:
         Returns:
             Updated Deployment object
         """
-        await self.db.commit()
-        await self.db.refresh(deployment)
+        await self.db.flush()
         return deployment
 
     async def delete(self, deployment: Deployment) -> None:
@@ -303,5 +672,19 @@ class DeploymentRepository:
             deployment: Deployment object to delete
         """
         await self.db.delete(deployment)
-        await self.db.commit()
+        await self.db.flush()
+
+    async def delete_by_id(self, deployment_id: int) -> bool:
+        """
+        Delete a deployment with a single DELETE statement.
 
+        Args:
+            deployment_id: The deployment ID
+
+        Returns:
+            True if a deployment was deleted, False otherwise
+        """
+        result = await self.db.execute(
+            delete(Deployment).where(Deployment.id == deployment_id)
+        )
+        return result.rowcount > 0
@@ -5,11 +5,26 @@ Handles all database queries related to users.
 
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import RowMapping, bindparam, select
 
 from app.models.user import User
 from app.schemas.user import UserCreate
 
+# Columns returned by get_by_email_lite (the fields of UserResponse plus the hash)
+_LOGIN_COLUMNS = (
+    User.id,
+    User.email,
+    User.role,
+    User.created_at,
+    User.updated_at,
+    User.password_hash,
+)
+
+# Read statements are built once at import and executed with bound parameters
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_LOGIN_ROW_BY_EMAIL = select(*_LOGIN_COLUMNS).where(User.email == bindparam("email"))
+_USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email")).limit(1)
+
 
 class UserRepository:
     """Repository for user data access operations."""
@@ -26,6 +41,7 @@ class UserRepository:
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """
         Get a user by ID.
+        Served from the session's identity map when the user is already loaded.
 
         Args:
             user_id: The user ID
@@ -33,8 +49,7 @@ class UserRepository:
         Returns:
             User object if found, None otherwise
         """
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        return result.scalar_one_or_none()
+        return await self.db.get(User, user_id)
 
     async def get_by_email(self, email: str) -> Optional[User]:
         """
@@ -46,8 +61,32 @@ class UserRepository:
         Returns:
             User object if found, None otherwise
         """
-        result = await self.db.execute(select(User).where(User.email == email))
-        return result.scalar_one_or_none()
+        return await self.db.scalar(_USER_BY_EMAIL, {"email": email})
+
+    async def get_by_email_lite(self, email: str) -> Optional[RowMapping]:
+        """
+        Get a user's columns by email without loading an ORM object.
+
+        Args:
+            email: The user email
+
+        Returns:
+            Row mapping of the user's columns (including password_hash) if found, None otherwise
+        """
+        result = await self.db.execute(_LOGIN_ROW_BY_EMAIL, {"email": email})
+        return result.mappings().one_or_none()
+
+    async def email_exists(self, email: str) -> bool:
+        """
+        Check whether a user with the given email exists.
+
+        Args:
+            email: The user email
+
+        Returns:
+            True if the email is registered, False otherwise
+        """
+        return await self.db.scalar(_USER_ID_BY_EMAIL, {"email": email}) is not None
 
     async def create(self, user_data: UserCreate, password_hash: str) -> User:
         """
@@ -66,8 +105,7 @@ class UserRepository:
             role=user_data.role,
         )
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         return user
 
     async def update(self, user: User) -> User:
@@ -80,7 +118,6 @@ class UserRepository:
         Returns:
             Updated User object
         """
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         return user
 
@@ -3,7 +3,7 @@ Model registry Pydantic schemas for request/response validation.
 """
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from app.models.model import ModelType, ModelVersionStatus
@@ -36,6 +36,8 @@ class ModelResponse(ModelBase):
     model_config = ConfigDict(
         from_attributes=True,
         protected_namespaces=(),
+        frozen=True,
+        extra="forbid",
     )
     
     id: int
@@ -44,12 +46,6 @@ class ModelResponse(ModelBase):
     updated_at: datetime
 
 
-class ModelWithVersions(ModelResponse):
-    """Schema for model with versions."""
-
-    versions: List["ModelVersionResponse"] = []
-
-
 # ModelVersion Schemas
 class ModelVersionBase(BaseModel):
     """Base schema for model version operations."""
@@ -83,6 +79,8 @@ class ModelVersionResponse(ModelVersionBase):
     model_config = ConfigDict(
         from_attributes=True,
         protected_namespaces=(),
+        frozen=True,
+        extra="forbid",
     )
     
     id: int
@@ -92,14 +90,6 @@ class ModelVersionResponse(ModelVersionBase):
     updated_at: datetime
 
 
-class ModelVersionWithModel(ModelVersionResponse):
-    """Schema for model version with model information."""
-
-    model_config = ConfigDict(protected_namespaces=())
-    
-    model: ModelResponse
-
-
 # Deployment Schemas
 class DeploymentBase(BaseModel):
     """Base schema for deployment operations."""
@@ -130,6 +120,8 @@ class DeploymentResponse(DeploymentBase):
     model_config = ConfigDict(
         from_attributes=True,
         protected_namespaces=(),
+        frozen=True,
+        extra="forbid",
     )
     
     id: int
@@ -138,18 +130,3 @@ class DeploymentResponse(DeploymentBase):
     url: Optional[str]
     created_at: datetime
     updated_at: datetime
-
-
-class DeploymentWithVersion(DeploymentResponse):
-    """Schema for deployment with model version information."""
-
-    model_config = ConfigDict(protected_namespaces=())
-    
-    model_version: ModelVersionResponse
-
-
-# Update forward references for nested models
-ModelWithVersions.model_rebuild()
-ModelVersionWithModel.model_rebuild()
-DeploymentWithVersion.model_rebuild()
-
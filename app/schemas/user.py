@@ -2,16 +2,48 @@
 User Pydantic schemas for request/response validation.
 """
 
+import re
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from typing import Annotated
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict
 
 from app.models.user import UserRole
 
+# One "@", no whitespace and a dotted domain
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _normalize_email(value: str) -> str:
+    """
+    Check an email address and lowercase its domain.
+    The local part is kept as-is, matching email-validator's normalization.
+
+    Args:
+        value: Email address
+
+    Returns:
+        Normalized email address
+
+    Raises:
+        ValueError: If the value is not a valid email address
+    """
+    if not _EMAIL_RE.match(value):
+        raise ValueError("value is not a valid email address")
+    local, domain = value.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
+
+
+EmailAddress = Annotated[
+    str,
+    Field(max_length=254, json_schema_extra={"format": "email"}),
+    AfterValidator(_normalize_email),
+]
+
 
 class UserCreate(BaseModel):
     """Schema for creating a new user."""
 
-    email: EmailStr = Field(..., description="User email address")
+    email: EmailAddress = Field(..., description="User email address")
     password: str = Field(..., min_length=8, description="User password (min 8 characters)")
     role: UserRole = Field(default=UserRole.USER, description="User role")
 
@@ -22,6 +54,8 @@ class UserResponse(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         protected_namespaces=(),
+        frozen=True,
+        extra="forbid",
     )
 
     id: int
@@ -34,7 +68,7 @@ class UserResponse(BaseModel):
 class UserLogin(BaseModel):
     """Schema for user login."""
 
-    email: EmailStr
+    email: EmailAddress
     password: str
 
 
@@ -3,18 +3,46 @@ Deployment service for managing Kubernetes deployments via Helm.
 Handles Helm install/uninstall operations and Ingress creation.
 """
 
+import asyncio
 import logging
+import shutil
 import subprocess
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import orjson
+from kubernetes.client.rest import ApiException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.core.kubernetes_client import KubernetesClient
+from app.core.kubernetes_client import get_kubernetes_client
 
 logger = logging.getLogger(__name__)
 
+# Install flags that are the same for every release; per-release values are
+# rendered as JSON (valid YAML) and read by helm from stdin
+_STATIC_INSTALL_ARGS = (
+    "--create-namespace",
+    "--values", "-",
+)
+
+# Caps concurrent helm processes so a burst of deploys doesn't flood the
+# kube-apiserver; callers beyond the cap wait without blocking the event loop
+_HELM_SLOTS = asyncio.Semaphore(settings.HELM_MAX_CONCURRENCY)
+
+
+@lru_cache(maxsize=1)
+def _helm_binary() -> str:
+    """
+    Resolve the helm executable once per process.
+
+    Returns:
+        Absolute path to helm, or "helm" to fall back to a PATH lookup
+    """
+    return shutil.which("helm") or "helm"
+
 
 class HelmDeploymentService:
     """
@@ -25,44 +53,51 @@ class HelmDeploymentService:
     def __init__(self):
         """Initialize Helm deployment service."""
         self.chart_path = Path(__file__).parent.parent.parent / "charts" / "model-serving"
-        self.k8s_client = KubernetesClient()
+        self.helm = _helm_binary()
+        self.k8s_client = get_kubernetes_client()
 
-    def _run_helm_command(
+    async def _run_helm_command(
         self,
         command: list[str],
-        timeout: int = 300
+        timeout: int = 300,
+        input: Optional[bytes] = None
     ) -> tuple[int, str, str]:
         """
-        Run a Helm command and return the result.
+        Run a Helm command without blocking the event loop.
+        At most HELM_MAX_CONCURRENCY commands run at once; the timeout
+        covers only the command itself, not the wait for a slot.
 
         Args:
             command: Helm command as list of strings
             timeout: Command timeout in seconds
+            input: Data written to the command's stdin
 
         Returns:
             Tuple of (return_code, stdout, stderr)
 
         Raises:
             subprocess.TimeoutExpired: If command times out
-            subprocess.SubprocessError: If command fails
+            OSError: If the helm binary cannot be started
         """
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False
+        async with _HELM_SLOTS:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE if input is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.TimeoutExpired as e:
-            logger.error(f"Helm command timed out: {' '.join(command)}")
-            raise
-        except subprocess.SubprocessError as e:
-            logger.error(f"Helm command failed: {' '.join(command)}: {str(e)}")
-            raise
-
-    def deploy_model(
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(input), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error("Helm command timed out: %s %s", command[1], command[2])
+                raise subprocess.TimeoutExpired(command, timeout) from None
+        return process.returncode, stdout.decode(), stderr.decode()
+
+    async def deploy_model(
         self,
         release_name: str,
         namespace: str,
@@ -111,34 +146,47 @@ class HelmDeploymentService:
         ingress_host = ingress_host or settings.INGRESS_HOST
         ingress_path = ingress_path or f"{settings.INGRESS_BASE_PATH}/{release_name}"
 
-        # Build Helm install command
+        values: Dict[str, Any] = {
+            "model": {
+                "s3Path": s3_path,
+                "s3Endpoint": s3_endpoint,
+                "s3AccessKey": s3_access_key,
+                "s3SecretKey": s3_secret_key,
+                "s3Bucket": s3_bucket,
+                "s3UseSSL": s3_use_ssl,
+            },
+            "deployment": {
+                "replicas": replicas,
+                "image": {"repository": image_repository, "tag": image_tag},
+            },
+            "ingress": {
+                "enabled": ingress_enabled,
+                "hosts": [
+                    {
+                        "host": ingress_host,
+                        "paths": [{"path": ingress_path, "pathType": "Prefix"}],
+                    }
+                ],
+            },
+            "monitoring": {"serviceMonitor": {"enabled": True}},
+        }
+
+        # Build Helm install command; values (including S3 credentials) go via stdin
         helm_command = [
-            "helm",
+            self.helm,
             "install",
             release_name,
             str(self.chart_path),
             "--namespace", namespace,
-            "--create-namespace",
-            "--set", f"model.s3Path={s3_path}",
-            "--set", f"model.s3Endpoint={s3_endpoint}",
-            "--set", f"model.s3AccessKey={s3_access_key}",
-            "--set", f"model.s3SecretKey={s3_secret_key}",
-            "--set", f"model.s3Bucket={s3_bucket}",
-            "--set", f"model.s3UseSSL={str(s3_use_ssl).lower()}",
-            "--set", f"deployment.replicas={replicas}",
-            "--set", f"deployment.image.repository={image_repository}",
-            "--set", f"deployment.image.tag={image_tag}",
-            "--set", f"ingress.enabled={str(ingress_enabled).lower()}",
-            "--set", f"ingress.hosts[0].host={ingress_host}",
-            "--set", f"ingress.hosts[0].paths[0].path={ingress_path}",
-            "--set", f"ingress.hosts[0].paths[0].pathType=Prefix",
-            "--set", "monitoring.serviceMonitor.enabled=true",
+            *_STATIC_INSTALL_ARGS,
         ]
 
-        logger.info(f"Deploying model with Helm: {' '.join(helm_command)}")
+        logger.info("Deploying model with Helm: release %s in %s", release_name, namespace)
 
         # Run Helm install
-        returncode, stdout, stderr = self._run_helm_command(helm_command)
+        returncode, stdout, stderr = await self._run_helm_command(
+            helm_command, input=orjson.dumps(values)
+        )
 
         if returncode != 0:
             error_msg = f"Helm install failed: {stderr}"
@@ -162,7 +210,7 @@ class HelmDeploymentService:
             "stdout": stdout
         }
 
-    def undeploy_model(
+    async def undeploy_model(
         self,
         release_name: str,
         namespace: str
@@ -178,15 +226,15 @@ class HelmDeploymentService:
             subprocess.SubprocessError: If Helm uninstall fails
         """
         helm_command = [
-            "helm",
+            self.helm,
             "uninstall",
             release_name,
             "--namespace", namespace
         ]
 
-        logger.info(f"Undeploying model with Helm: {' '.join(helm_command)}")
+        logger.info("Undeploying model with Helm: release %s in %s", release_name, namespace)
 
-        returncode, stdout, stderr = self._run_helm_command(helm_command)
+        returncode, stdout, stderr = await self._run_helm_command(helm_command)
 
         if returncode != 0:
             # If release doesn't exist, that's okay (idempotent)
@@ -199,13 +247,15 @@ class HelmDeploymentService:
 
         logger.info(f"Helm uninstall successful for release {release_name}")
 
-    def get_deployment_status(
+    async def get_deployment_status(
         self,
         release_name: str,
         namespace: str
-    ) -> dict:
+    ) -> Dict[str, Any]:
         """
         Get the status of a Helm deployment.
+        Reads the release's Deployment from the Kubernetes API directly
+        instead of shelling out to `helm status`.
 
         Args:
             release_name: Helm release name
@@ -214,25 +264,23 @@ class HelmDeploymentService:
         Returns:
             Dictionary with deployment status information
         """
-        helm_command = [
-            "helm",
-            "status",
-            release_name,
-            "--namespace", namespace,
-            "--output", "json"
-        ]
-
-        returncode, stdout, stderr = self._run_helm_command(helm_command)
+        try:
+            replica_status = await asyncio.to_thread(
+                self.k8s_client.get_release_deployment_status, namespace, release_name
+            )
+        except ApiException as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
 
-        if returncode != 0:
+        if replica_status is None:
             return {
                 "status": "not_found",
-                "error": stderr
+                "error": f"Release {release_name} not found in namespace {namespace}"
             }
 
-        # Parse JSON output (simplified - in production, use proper JSON parsing)
         return {
             "status": "deployed",
-            "output": stdout
+            **replica_status
         }
-
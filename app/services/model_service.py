@@ -2,10 +2,12 @@
 Model service containing business logic for model operations.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple, TypeVar
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 
 from app.repositories.model_repository import (
     ModelRepository,
@@ -27,6 +29,71 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Public URL of a deployment is this prefix plus "/{deployment.id}"
+_PREDICT_URL_PREFIX = f"http://{settings.INGRESS_HOST}:30080{settings.INGRESS_BASE_PATH}"
+
+# Helm arguments that are the same for every deployment. Models are pulled
+# from Minio's in-cluster service name, not settings.MINIO_ENDPOINT.
+_STATIC_DEPLOY_ARGS = {
+    "s3_endpoint": "minio:9000",
+    "s3_access_key": settings.MINIO_ACCESS_KEY,
+    "s3_secret_key": settings.MINIO_SECRET_KEY,
+    "s3_use_ssl": settings.MINIO_USE_SSL,
+    "ingress_enabled": True,
+    "ingress_host": settings.INGRESS_HOST,
+}
+
+# Responses are built from ORM objects with from_attributes validation, which
+# reads the attributes inside pydantic-core and beats a Python getattr loop.
+# The list adapters do the same for whole result pages.
+_VERSION_LIST = TypeAdapter(List[ModelVersionResponse])
+_DEPLOYMENT_LIST = TypeAdapter(List[DeploymentResponse])
+
+
+def _split_s3_path(s3_path: str) -> Tuple[str, str]:
+    """
+    Split a stored artifact path into its bucket and canonical s3:// URL.
+
+    Args:
+        s3_path: "s3://bucket/path/to/model.joblib" or "bucket/path/to/model.joblib"
+
+    Returns:
+        Tuple of (bucket, "s3://bucket/key")
+    """
+    bucket, _, key = s3_path.removeprefix("s3://").partition("/")
+    return bucket, f"s3://{bucket}/{key}"
+
+
+def _owned_or_raise(row: Optional[Tuple[T, int]], user_id: int, not_found: str) -> T:
+    """
+    Unpack an (entity, owner user ID) row, enforcing ownership.
+
+    Args:
+        row: Row from a repository get_by_id_with_owner call
+        user_id: User ID making the request
+        not_found: Error detail used when the row is missing
+
+    Returns:
+        The entity
+
+    Raises:
+        HTTPException: 404 if the row is missing, 403 if owned by another user
+    """
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found,
+        )
+    entity, owner_id = row
+    if owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+    return entity
+
 
 class ModelService:
     """Service for model business logic operations."""
@@ -38,6 +105,7 @@ class ModelService:
         Args:
             db: Database session
         """
+        self.db = db
         self.repository = ModelRepository(db)
         self.version_repository = ModelVersionRepository(db)
         self.deployment_repository = DeploymentRepository(db)
@@ -61,6 +129,7 @@ class ModelService:
 
         # Create model via repository
         model = await self.repository.create(model_data, user_id)
+        await self.db.commit()
         return ModelResponse.model_validate(model)
 
     async def get_model(self, model_id: int, user_id: int) -> ModelResponse:
@@ -77,26 +146,37 @@ class ModelService:
         Raises:
             HTTPException: If model not found or not owned by user
         """
-        model = await self.repository.get_by_id(model_id, user_id)
-        if not model:
+        row = await self.repository.get_by_id_lite(model_id, user_id)
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Model not found",
             )
-        return ModelResponse.model_validate(model)
+        # Rows come straight from the database, so validation is skipped
+        return ModelResponse.model_construct(**row)
 
-    async def get_all_models(self, user_id: int) -> List[ModelResponse]:
+    async def get_all_models(
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> List[ModelResponse]:
         """
-        Get all models for a user.
+        Get a page of models for a user.
 
         Args:
             user_id: User ID
+            offset: Number of models to skip
+            limit: Maximum number of models to return
+            after_id: Only return models with a larger ID (keyset cursor)
 
         Returns:
             List of model responses
         """
-        models = await self.repository.get_all_by_user(user_id)
-        return [ModelResponse.model_validate(model) for model in models]
+        rows = await self.repository.get_all_by_user_lite(user_id, offset, limit, after_id)
+        construct = ModelResponse.model_construct
+        return [construct(**row) for row in rows]
 
     async def delete_model(self, model_id: int, user_id: int) -> None:
         """
@@ -109,13 +189,13 @@ class ModelService:
         Raises:
             HTTPException: If model not found or not owned by user
         """
-        model = await self.repository.get_by_id(model_id, user_id)
-        if not model:
+        deleted = await self.repository.delete_by_id(model_id, user_id)
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Model not found",
             )
-        await self.repository.delete(model)
+        await self.db.commit()
 
 
 class ModelVersionService:
@@ -128,6 +208,7 @@ class ModelVersionService:
         Args:
             db: Database session
         """
+        self.db = db
         self.repository = ModelVersionRepository(db)
         self.model_repository = ModelRepository(db)
 
@@ -148,25 +229,22 @@ class ModelVersionService:
             HTTPException: If model not found or validation fails
         """
         # Business rule: Verify model exists and belongs to user
-        model = await self.model_repository.get_by_id(version_data.model_id, user_id)
-        if not model:
+        if not await self.model_repository.get_by_id_lite(version_data.model_id, user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Model not found",
             )
 
-        # Business rule: Check if version tag already exists for this model
-        existing_version = await self.repository.get_by_model_and_tag(
-            version_data.model_id, version_data.version_tag
-        )
-        if existing_version:
+        # Business rule: Version tags are unique per model; the insert skips
+        # duplicates atomically and returns nothing for them
+        version = await self.repository.create(version_data)
+        if version is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Version tag '{version_data.version_tag}' already exists for this model",
             )
 
-        # Create version via repository
-        version = await self.repository.create(version_data)
+        await self.db.commit()
         return ModelVersionResponse.model_validate(version)
 
     async def get_version(self, version_id: int, user_id: int) -> ModelVersionResponse:
@@ -183,32 +261,59 @@ class ModelVersionService:
         Raises:
             HTTPException: If version not found or model not owned by user
         """
-        version = await self.repository.get_by_id(version_id)
-        if not version:
+        version = _owned_or_raise(
+            await self.repository.get_by_id_with_owner(version_id), user_id, "Model version not found"
+        )
+
+        return ModelVersionResponse.model_validate(version)
+
+    async def get_version_with_model(
+        self, version_id: int, user_id: int
+    ) -> Tuple[ModelVersionResponse, ModelResponse]:
+        """
+        Get a model version together with its model in one round-trip,
+        ensuring model ownership.
+
+        Args:
+            version_id: Version ID
+            user_id: User ID (for ownership verification)
+
+        Returns:
+            Tuple of model version response and model response
+
+        Raises:
+            HTTPException: If version not found or model not owned by user
+        """
+        row = await self.repository.get_by_id_with_model(version_id, user_id)
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Model version not found",
             )
 
-        # Verify ownership through model
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
-
-        return ModelVersionResponse.model_validate(version)
+        version, model = row
+        return (
+            ModelVersionResponse.model_validate(version),
+            ModelResponse.model_validate(model),
+        )
 
     async def get_versions_by_model(
-        self, model_id: int, user_id: int
+        self,
+        model_id: int,
+        user_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
     ) -> List[ModelVersionResponse]:
         """
-        Get all versions for a model, ensuring ownership.
+        Get a page of versions for a model, ensuring ownership.
 
         Args:
             model_id: Model ID
             user_id: User ID (for ownership verification)
+            offset: Number of versions to skip
+            limit: Maximum number of versions to return
+            after_id: Only return versions with a larger ID (keyset cursor)
 
         Returns:
             List of model version responses
@@ -216,16 +321,19 @@ class ModelVersionService:
         Raises:
             HTTPException: If model not found or not owned by user
         """
-        # Verify ownership
-        model = await self.model_repository.get_by_id(model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model not found",
-            )
-
-        versions = await self.repository.get_by_model_id(model_id)
-        return [ModelVersionResponse.model_validate(version) for version in versions]
+        versions = await self.repository.get_by_model_id_for_user(
+            model_id, user_id, offset, limit, after_id
+        )
+        # An empty page may mean the model is missing or not owned; only then
+        # is a separate ownership lookup needed
+        if not versions:
+            model = await self.model_repository.get_by_id(model_id, user_id)
+            if not model:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Model not found",
+                )
+        return _VERSION_LIST.validate_python(versions, from_attributes=True)
 
     async def update_version_status(
         self, version_id: int, status: ModelVersionStatus, user_id: int
@@ -244,35 +352,39 @@ class ModelVersionService:
         Raises:
             HTTPException: If version not found or not owned by user
         """
-        version = await self.repository.get_by_id(version_id)
-        if not version:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model version not found",
-            )
-
-        # Verify ownership
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
+        version = _owned_or_raise(
+            await self.repository.get_by_id_with_owner(version_id), user_id, "Model version not found"
+        )
 
         version.status = status
         updated_version = await self.repository.update(version)
+        await self.db.commit()
         return ModelVersionResponse.model_validate(updated_version)
 
+    async def find_model_artifact(self, sha256: str, user_id: int) -> Optional[str]:
+        """
+        Find an already-stored model file of the user's with the same content.
+
+        Args:
+            sha256: Hex SHA-256 digest of the model file
+            user_id: User ID
+
+        Returns:
+            S3 path of the matching artifact, None if there is none
+        """
+        return await self.repository.get_s3_path_by_sha256(sha256, user_id)
+
     async def update_version_s3_path(
-        self, version_id: int, s3_path: str, user_id: int
+        self, version_id: int, s3_path: str, user_id: int, sha256: Optional[str] = None
     ) -> ModelVersionResponse:
         """
-        Update a model version S3 path.
+        Record newly uploaded artifacts and flip the version back to BUILDING.
 
         Args:
             version_id: Version ID
             s3_path: New S3 path
             user_id: User ID (for ownership verification)
+            sha256: Hex SHA-256 digest of the model file at s3_path
 
         Returns:
             Updated model version response
@@ -280,23 +392,16 @@ class ModelVersionService:
         Raises:
             HTTPException: If version not found or not owned by user
         """
-        version = await self.repository.get_by_id(version_id)
-        if not version:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model version not found",
-            )
-
-        # Verify ownership
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
+        version = _owned_or_raise(
+            await self.repository.get_by_id_with_owner(version_id), user_id, "Model version not found"
+        )
 
+        # The new artifacts have not been built yet
         version.s3_path = s3_path
+        version.sha256 = sha256
+        version.status = ModelVersionStatus.BUILDING
         updated_version = await self.repository.update(version)
+        await self.db.commit()
         return ModelVersionResponse.model_validate(updated_version)
 
 
@@ -310,9 +415,9 @@ class DeploymentService:
         Args:
             db: Database session
         """
+        self.db = db
         self.repository = DeploymentRepository(db)
         self.version_repository = ModelVersionRepository(db)
-        self.model_repository = ModelRepository(db)
         self.helm_service = HelmDeploymentService()
 
     async def create_deployment(
@@ -332,20 +437,11 @@ class DeploymentService:
             HTTPException: If version not found or validation fails
         """
         # Business rule: Verify version exists and belongs to user
-        version = await self.version_repository.get_by_id(deployment_data.version_id)
-        if not version:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model version not found",
-            )
-
-        # Verify ownership through model
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
+        version = _owned_or_raise(
+            await self.version_repository.get_by_id_with_owner(deployment_data.version_id),
+            user_id,
+            "Model version not found",
+        )
 
         # Business rule: Version must be READY before deployment
         if version.status != ModelVersionStatus.READY:
@@ -361,58 +457,40 @@ class DeploymentService:
                 detail="Model version must have an S3 path. Please upload the model first.",
             )
 
-        # Create deployment record in database first (to get deployment.id)
+        # Create deployment record in database first (to get deployment.id).
+        # Commit before running Helm so no transaction is held open meanwhile.
         deployment = await self.repository.create(deployment_data)
+        await self.db.commit()
 
         # Deploy to Kubernetes using Helm
         namespace = f"user-{user_id}"
         release_name = deployment.k8s_service_name  # Use the generated service name as release name
         
         try:
-            # Parse S3 path to extract bucket and key
-            # Format: s3://bucket/path/to/model.joblib or bucket/path/to/model.joblib
-            s3_path = version.s3_path
-            if s3_path.startswith("s3://"):
-                s3_path = s3_path[5:]  # Remove s3:// prefix
-            
-            # Split into bucket and key
-            parts = s3_path.split("/", 1)
-            s3_bucket = parts[0] if len(parts) > 0 else settings.MINIO_BUCKET_NAME
-            s3_key = parts[1] if len(parts) > 1 else ""
-            
-            # Full S3 path for Helm
-            full_s3_path = f"s3://{s3_bucket}/{s3_key}" if s3_key else f"s3://{s3_bucket}/"
-            
-            # Determine S3 endpoint (use internal service name for Kubernetes)
-            # For local dev, use minio:9000 (internal to cluster)
-            # For external, use settings.MINIO_ENDPOINT
-            s3_endpoint = "minio:9000"  # Internal cluster endpoint
+            s3_bucket, full_s3_path = _split_s3_path(version.s3_path)
             
             # Deploy using Helm with deployment_id in the ingress path
-            deployment_info = self.helm_service.deploy_model(
+            deployment_info = await self.helm_service.deploy_model(
                 release_name=release_name,
                 namespace=namespace,
                 s3_path=full_s3_path,
-                s3_endpoint=s3_endpoint,
-                s3_access_key=settings.MINIO_ACCESS_KEY,
-                s3_secret_key=settings.MINIO_SECRET_KEY,
                 s3_bucket=s3_bucket,
-                s3_use_ssl=settings.MINIO_USE_SSL,
                 replicas=deployment_data.replicas,
-                ingress_enabled=True,
-                ingress_host=settings.INGRESS_HOST,
-                ingress_path=f"{settings.INGRESS_BASE_PATH}/{deployment.id}"  # Use deployment.id in path
+                ingress_path=f"{settings.INGRESS_BASE_PATH}/{deployment.id}",  # Use deployment.id in path
+                **_STATIC_DEPLOY_ARGS,
             )
             
             # Update deployment with URL (using deployment.id)
-            deployment.url = f"http://{settings.INGRESS_HOST}:30080{settings.INGRESS_BASE_PATH}/{deployment.id}"
+            deployment.url = f"{_PREDICT_URL_PREFIX}/{deployment.id}"
             deployment = await self.repository.update(deployment)
+            await self.db.commit()
             
             logger.info(f"Successfully deployed model version {version.id} as deployment {deployment.id}")
             
         except Exception as e:
             # If Helm deployment fails, delete the database record
             await self.repository.delete(deployment)
+            await self.db.commit()
             logger.error(f"Failed to deploy model version {version.id}: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -437,39 +515,27 @@ class DeploymentService:
         Raises:
             HTTPException: If deployment not found or not owned by user
         """
-        deployment = await self.repository.get_by_id(deployment_id)
-        if not deployment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Deployment not found",
-            )
-
-        # Verify ownership through version -> model
-        version = await self.version_repository.get_by_id(deployment.version_id)
-        if not version:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model version not found",
-            )
-
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
+        deployment = _owned_or_raise(
+            await self.repository.get_by_id_with_owner(deployment_id), user_id, "Deployment not found"
+        )
 
         return DeploymentResponse.model_validate(deployment)
 
     async def get_deployments_by_version(
-        self, version_id: int, user_id: int
+        self,
+        version_id: int,
+        user_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> List[DeploymentResponse]:
         """
-        Get all deployments for a model version, ensuring ownership.
+        Get a page of deployments for a model version, ensuring ownership.
 
         Args:
             version_id: Version ID
             user_id: User ID (for ownership verification)
+            offset: Number of deployments to skip
+            limit: Maximum number of deployments to return
 
         Returns:
             List of deployment responses
@@ -477,25 +543,18 @@ class DeploymentService:
         Raises:
             HTTPException: If version not found or not owned by user
         """
-        # Verify ownership
-        version = await self.version_repository.get_by_id(version_id)
-        if not version:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model version not found",
-            )
-
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
+        deployments = await self.repository.get_by_version_id_for_user(
+            version_id, user_id, offset, limit
+        )
+        # An empty page may mean the version is missing or not owned; only then
+        # is a separate ownership lookup needed
+        if not deployments:
+            _owned_or_raise(
+                await self.version_repository.get_by_id_with_owner(version_id),
+                user_id,
+                "Model version not found",
             )
-
-        deployments = await self.repository.get_by_version_id(version_id)
-        return [
-            DeploymentResponse.model_validate(deployment) for deployment in deployments
-        ]
+        return _DEPLOYMENT_LIST.validate_python(deployments, from_attributes=True)
 
     async def delete_deployment(self, deployment_id: int, user_id: int) -> None:
         """
@@ -508,43 +567,45 @@ class DeploymentService:
         Raises:
             HTTPException: If deployment not found or not owned by user
         """
-        deployment = await self.repository.get_by_id(deployment_id)
-        if not deployment:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Deployment not found",
-            )
+        deployment = _owned_or_raise(
+            await self.repository.get_by_id_with_owner(deployment_id), user_id, "Deployment not found"
+        )
 
-        # Verify ownership
-        version = await self.version_repository.get_by_id(deployment.version_id)
-        if not version:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Model version not found",
-            )
+        # The Helm uninstall and the database delete are independent, so the
+        # delete commits while the uninstall subprocess is still running
+        await asyncio.gather(
+            self._undeploy_release(deployment.id, deployment.k8s_service_name, f"user-{user_id}"),
+            self._delete_record(deployment.id),
+        )
 
-        model = await self.model_repository.get_by_id(version.model_id, user_id)
-        if not model:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
+    async def _undeploy_release(
+        self, deployment_id: int, release_name: str, namespace: str
+    ) -> None:
+        """
+        Uninstall a deployment's Helm release, logging rather than raising on failure
+        so the database record is cleaned up even if Helm uninstall fails.
 
-        # Undeploy from Kubernetes using Helm
-        namespace = f"user-{user_id}"
-        release_name = deployment.k8s_service_name
-        
+        Args:
+            deployment_id: Deployment ID
+            release_name: Helm release name
+            namespace: Kubernetes namespace
+        """
         try:
-            self.helm_service.undeploy_model(
+            await self.helm_service.undeploy_model(
                 release_name=release_name,
                 namespace=namespace
             )
-            logger.info(f"Successfully undeployed model deployment {deployment.id}")
+            logger.info(f"Successfully undeployed model deployment {deployment_id}")
         except Exception as e:
-            # Log error but continue with database deletion
-            # This allows cleanup even if Helm uninstall fails
             logger.warning(f"Failed to undeploy Helm release {release_name}: {str(e)}. Continuing with database cleanup.")
 
-        # Delete deployment record from database
-        await self.repository.delete(deployment)
+    async def _delete_record(self, deployment_id: int) -> None:
+        """
+        Delete a deployment record and commit.
+
+        Args:
+            deployment_id: Deployment ID
+        """
+        await self.repository.delete_by_id(deployment_id)
+        await self.db.commit()
 
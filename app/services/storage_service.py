@@ -3,12 +3,60 @@ Storage service for handling model artifact uploads.
 Contains business logic for file validation and S3 path generation.
 """
 
-from typing import Tuple
+import asyncio
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from typing import AbstractSet, BinaryIO, Optional, Tuple
 from fastapi import HTTPException, status, UploadFile
 from minio.error import S3Error
 
 from app.core.storage import StorageClient
 
+logger = logging.getLogger(__name__)
+
+# One character that is neither alphanumeric (Unicode-aware, like str.isalnum)
+# nor "-" or "_"
+_UNSAFE_NAME_CHAR = re.compile(r"[^\w-]")
+
+# Read size when hashing uploads; hashlib releases the GIL on buffers this large
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Object metadata key holding the model file's SHA-256, checked before reuse
+SHA256_METADATA_KEY = "sha256"
+
+
+def _sha256_of(stream: BinaryIO) -> str:
+    """
+    Compute the SHA-256 digest of a stream and rewind it.
+
+    Args:
+        stream: Readable, seekable binary stream positioned at the start
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=2048)
+def _sanitize_model_name(model_name: str) -> str:
+    """
+    Make a model name safe for use in an S3 key.
+
+    Args:
+        model_name: Model name
+
+    Returns:
+        Lowercased name with every other character replaced by "_"
+    """
+    return _UNSAFE_NAME_CHAR.sub("_", model_name).lower()
+
 
 class StorageService:
     """Service for storage operations with business logic."""
@@ -18,15 +66,15 @@ class StorageService:
     MAX_REQUIREMENTS_FILE_SIZE = 1024 * 1024  # 1 MB
 
     # Allowed file extensions
-    ALLOWED_MODEL_EXTENSIONS = {".joblib", ".pkl", ".pickle"}
-    ALLOWED_REQUIREMENTS_EXTENSIONS = {".txt"}
+    ALLOWED_MODEL_EXTENSIONS = frozenset({".joblib", ".pkl", ".pickle"})
+    ALLOWED_REQUIREMENTS_EXTENSIONS = frozenset({".txt"})
 
     def __init__(self):
         """Initialize storage service with Minio client."""
         self.storage_client = StorageClient()
 
     def _validate_file(
-        self, file: UploadFile, max_size: int, allowed_extensions: set
+        self, file: UploadFile, max_size: int, allowed_extensions: AbstractSet[str]
     ) -> None:
         """
         Validate uploaded file.
@@ -34,7 +82,7 @@ class StorageService:
         Args:
             file: Uploaded file
             max_size: Maximum file size in bytes
-            allowed_extensions: Set of allowed file extensions
+            allowed_extensions: Allowed single-dot file extensions, lowercase (e.g. ".pkl")
 
         Raises:
             HTTPException: If validation fails
@@ -45,22 +93,174 @@ class StorageService:
                 detail="File must have a filename",
             )
 
-        # Check file extension
-        file_ext = None
-        for ext in allowed_extensions:
-            if file.filename.lower().endswith(ext):
-                file_ext = ext
-                break
-
-        if file_ext is None:
+        # Check file extension with one set lookup on the text after the last dot
+        _, dot, suffix = file.filename.rpartition(".")
+        if not dot or f".{suffix.lower()}" not in allowed_extensions:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File extension not allowed. Allowed: {', '.join(allowed_extensions)}",
+                detail=f"File extension not allowed. Allowed: {', '.join(sorted(allowed_extensions))}",
             )
 
         # Note: File size validation would need to read the file
         # We'll do this during upload
 
+    @staticmethod
+    def _file_size(file: UploadFile) -> int:
+        """
+        Get the size of an uploaded file and rewind it for streaming.
+
+        Args:
+            file: Uploaded file
+
+        Returns:
+            File size in bytes
+        """
+        file.file.seek(0, 2)
+        size = file.file.tell()
+        file.file.seek(0)
+        return size
+
+    def _checked_size(self, file: UploadFile, max_size: int, label: str) -> int:
+        """
+        Get the size of an uploaded file, rejecting it if it is over the limit.
+
+        Args:
+            file: Uploaded file
+            max_size: Maximum file size in bytes
+            label: Name of the file in the error message (e.g. "Model file")
+
+        Returns:
+            File size in bytes
+
+        Raises:
+            HTTPException: If the file is too large
+        """
+        size = self._file_size(file)
+        if size > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{label} too large. Max size: {max_size / (1024*1024):.0f} MB",
+            )
+        return size
+
+    def validate_artifacts(
+        self, model_file: UploadFile, requirements_file: UploadFile
+    ) -> Tuple[int, int]:
+        """
+        Validate both artifact files and measure them, without touching S3.
+
+        Args:
+            model_file: Uploaded model file
+            requirements_file: Uploaded requirements.txt file
+
+        Returns:
+            Tuple of (model_size, requirements_size) in bytes
+
+        Raises:
+            HTTPException: If validation fails
+        """
+        self._validate_file(
+            model_file, self.MAX_MODEL_FILE_SIZE, self.ALLOWED_MODEL_EXTENSIONS
+        )
+        self._validate_file(
+            requirements_file,
+            self.MAX_REQUIREMENTS_FILE_SIZE,
+            self.ALLOWED_REQUIREMENTS_EXTENSIONS,
+        )
+        # Measure the spooled uploads instead of reading them into memory
+        model_size = self._checked_size(
+            model_file, self.MAX_MODEL_FILE_SIZE, "Model file"
+        )
+        requirements_size = self._checked_size(
+            requirements_file, self.MAX_REQUIREMENTS_FILE_SIZE, "Requirements file"
+        )
+        return model_size, requirements_size
+
+    async def model_file_sha256(self, model_file: UploadFile) -> str:
+        """
+        Compute the content digest of a model file (see validate_artifacts).
+        Hashing runs in a worker thread and leaves the file rewound.
+
+        Args:
+            model_file: Uploaded model file
+
+        Returns:
+            Hex SHA-256 digest of the file
+        """
+        return await asyncio.to_thread(_sha256_of, model_file.file)
+
+    def _holds_content(self, object_name: str, sha256: str) -> bool:
+        """
+        Check that a stored object still has the given content, going by the
+        digest recorded in its metadata at upload time.
+
+        Keys are derived from lossily sanitized model names, so the object a
+        digest was recorded for may since have been overwritten.
+
+        Args:
+            object_name: S3 object key (path)
+            sha256: Expected hex SHA-256 digest
+
+        Returns:
+            True if the object's recorded digest matches
+        """
+        try:
+            return self.storage_client.get_metadata(object_name, SHA256_METADATA_KEY) == sha256
+        except S3Error as e:
+            logger.warning(f"Could not check {object_name}, uploading instead: {str(e)}")
+            return False
+
+    def _store_model_file(
+        self,
+        object_name: str,
+        model_file: UploadFile,
+        size: int,
+        sha256: Optional[str],
+        source_object_name: Optional[str],
+    ) -> str:
+        """
+        Put the model file at object_name, copying an identical stored object
+        server-side when there is one instead of uploading the bytes again.
+
+        Args:
+            object_name: S3 object key for the model file
+            model_file: Uploaded model file
+            size: File size in bytes
+            sha256: Hex SHA-256 digest of the file, recorded in its metadata
+            source_object_name: Key of an object with the same content, if any
+
+        Returns:
+            S3 path of the stored model file
+
+        Raises:
+            S3Error: If the upload fails
+        """
+        if source_object_name is not None:
+            try:
+                return self.storage_client.copy_file(source_object_name, object_name)
+            except S3Error as e:
+                # The source may have been removed since it was recorded
+                logger.warning(f"Copy from {source_object_name} failed, uploading instead: {str(e)}")
+        return self.storage_client.upload_stream(
+            object_name,
+            model_file.file,
+            size,
+            content_type="application/octet-stream",
+            metadata={SHA256_METADATA_KEY: sha256} if sha256 else None,
+        )
+
+    async def _discard_object(self, object_name: str) -> None:
+        """
+        Best-effort delete of an uploaded object after a partial upload failure.
+
+        Args:
+            object_name: S3 object key (path)
+        """
+        try:
+            await asyncio.to_thread(self.storage_client.delete_file, object_name)
+        except S3Error as e:
+            logger.warning(f"Failed to remove orphaned upload {object_name}: {str(e)}")
+
     def generate_s3_path(
         self, user_id: int, model_name: str, version_tag: str, filename: str
     ) -> str:
@@ -78,10 +278,7 @@ class StorageService:
         Returns:
             S3 object key (path)
         """
-        # Sanitize model name (remove special characters, spaces -> underscores)
-        sanitized_model_name = "".join(
-            c if c.isalnum() or c in ("-", "_") else "_" for c in model_name
-        ).lower()
+        sanitized_model_name = _sanitize_model_name(model_name)
 
         return f"models/{user_id}/{sanitized_model_name}/{version_tag}/{filename}"
 
@@ -92,9 +289,14 @@ class StorageService:
         version_tag: str,
         model_file: UploadFile,
         requirements_file: UploadFile,
+        model_size: int,
+        requirements_size: int,
+        model_sha256: Optional[str] = None,
+        model_source: Optional[str] = None,
     ) -> Tuple[str, str]:
         """
         Upload model artifacts (model file and requirements.txt) to S3.
+        The files must already have passed validate_artifacts.
 
         Args:
             user_id: User ID
@@ -102,41 +304,21 @@ class StorageService:
             version_tag: Version tag
             model_file: Uploaded model file
             requirements_file: Uploaded requirements.txt file
+            model_size: Model file size in bytes
+            requirements_size: Requirements file size in bytes
+            model_sha256: Hex SHA-256 digest of the model file
+                (see model_file_sha256), stored with the object
+            model_source: S3 path of a stored model file recorded with
+                model_sha256; if it still holds that content it is copied
+                instead of re-uploaded
 
         Returns:
             Tuple of (model_s3_path, requirements_s3_path)
 
         Raises:
-            HTTPException: If validation or upload fails
+            HTTPException: If upload fails
         """
-        # Validate files
-        self._validate_file(
-            model_file, self.MAX_MODEL_FILE_SIZE, self.ALLOWED_MODEL_EXTENSIONS
-        )
-        self._validate_file(
-            requirements_file,
-            self.MAX_REQUIREMENTS_FILE_SIZE,
-            self.ALLOWED_REQUIREMENTS_EXTENSIONS,
-        )
-
-        # Read file contents
         try:
-            model_content = await model_file.read()
-            requirements_content = await requirements_file.read()
-
-            # Check file sizes
-            if len(model_content) > self.MAX_MODEL_FILE_SIZE:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Model file too large. Max size: {self.MAX_MODEL_FILE_SIZE / (1024*1024):.0f} MB",
-                )
-
-            if len(requirements_content) > self.MAX_REQUIREMENTS_FILE_SIZE:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Requirements file too large. Max size: {self.MAX_REQUIREMENTS_FILE_SIZE / (1024*1024):.0f} MB",
-                )
-
             # Generate S3 paths
             model_s3_key = self.generate_s3_path(
                 user_id, model_name, version_tag, model_file.filename
@@ -145,25 +327,59 @@ class StorageService:
                 user_id, model_name, version_tag, requirements_file.filename
             )
 
-            # Upload files
-            try:
-                model_s3_path = self.storage_client.upload_file(
+            source_key = None
+            if model_source is not None and model_sha256 is not None:
+                bucket, _, key = model_source.removeprefix("s3://").partition("/")
+                if bucket == self.storage_client.bucket_name and key:
+                    source_key = key
+            if source_key is not None and not await asyncio.to_thread(
+                self._holds_content, source_key, model_sha256
+            ):
+                source_key = None
+
+            # Object key -> pending store. Re-uploading identical content to
+            # the same key stores nothing: the object is already in place, and
+            # it must survive a failed upload below
+            model_in_place = source_key == model_s3_key
+            stores = {}
+            if not model_in_place:
+                stores[model_s3_key] = asyncio.to_thread(
+                    self._store_model_file,
                     model_s3_key,
-                    model_content,
-                    content_type="application/octet-stream",
-                )
-                requirements_s3_path = self.storage_client.upload_file(
-                    requirements_s3_key,
-                    requirements_content,
-                    content_type="text/plain",
+                    model_file,
+                    model_size,
+                    model_sha256,
+                    source_key,
                 )
-            except S3Error as e:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to upload files to storage: {str(e)}",
-                ) from e
+            # The Minio client is blocking, so each upload runs in a worker thread
+            stores[requirements_s3_key] = asyncio.to_thread(
+                self.storage_client.upload_stream,
+                requirements_s3_key,
+                requirements_file.file,
+                requirements_size,
+                content_type="text/plain",
+            )
+
+            # Stream the files concurrently
+            results = dict(
+                zip(stores, await asyncio.gather(*stores.values(), return_exceptions=True))
+            )
+
+            errors = [result for result in results.values() if isinstance(result, BaseException)]
+            if errors:
+                # Don't leave half a set of artifacts behind
+                for key, result in results.items():
+                    if not isinstance(result, BaseException):
+                        await self._discard_object(key)
+                if isinstance(errors[0], S3Error):
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"Failed to upload files to storage: {str(errors[0])}",
+                    ) from errors[0]
+                raise errors[0]
 
-            return (model_s3_path, requirements_s3_path)
+            model_s3_path = model_source if model_in_place else results[model_s3_key]
+            return (model_s3_path, results[requirements_s3_key])
 
         except HTTPException:
             raise
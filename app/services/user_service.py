@@ -2,17 +2,60 @@
 User service containing business logic for user operations.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserResponse
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.cache import TTLCache
+from app.core.kubernetes_client import get_kubernetes_client
+from app.core.security import (
+    verify_password_async,
+    get_password_hash_async,
+    create_access_token,
+)
 
 logger = logging.getLogger(__name__)
 
+# Short-lived cache of user profiles by ID; staleness is bounded by the TTL
+_USER_CACHE = TTLCache(maxsize=10_000, ttl=30)
+
+# Per-user locks held while a cache miss is being filled, so concurrent
+# requests for the same user share one query. Each entry counts the requests
+# holding or waiting on its lock and is dropped when the last one leaves.
+_USER_LOOKUP_LOCKS: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
+# Login lookups in flight, by email. Concurrent logins for the same account
+# await the first request's query instead of issuing their own; entries only
+# live while that query runs, so the map is bounded by request concurrency.
+_LOGIN_LOOKUPS: Dict[str, "asyncio.Future[Optional[Mapping[str, Any]]]"] = {}
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """
+    Drop a cached user profile after the user changes.
+
+    Args:
+        user_id: User ID
+    """
+    _USER_CACHE.pop(user_id)
+
+
+def _user_response(row: Mapping[str, Any]) -> UserResponse:
+    """
+    Build a user response from a database row without re-validating it.
+
+    Args:
+        row: Row mapping containing at least the UserResponse fields
+
+    Returns:
+        User response
+    """
+    return UserResponse.model_construct(**{name: row[name] for name in UserResponse.model_fields})
+
 
 class UserService:
     """Service for user business logic operations."""
@@ -24,6 +67,7 @@ class UserService:
         Args:
             db: Database session
         """
+        self.db = db
         self.repository = UserRepository(db)
 
     async def create_user(self, user_data: UserCreate) -> UserResponse:
@@ -41,24 +85,24 @@ class UserService:
             HTTPException: If email already exists or validation fails
         """
         # Business rule: Check if email already exists
-        existing_user = await self.repository.get_by_email(user_data.email)
-        if existing_user:
+        if await self.repository.email_exists(user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
         # Business rule: Hash password before storing
-        password_hash = get_password_hash(user_data.password)
+        password_hash = await get_password_hash_async(user_data.password)
 
         # Create user via repository
         user = await self.repository.create(user_data, password_hash)
+        await self.db.commit()
+        invalidate_user_cache(user.id)
         
         # Create isolated Kubernetes namespace for the user
         # This is done after user creation so we have the user ID
         try:
-            from app.core.kubernetes_client import KubernetesClient
-            k8s_client = KubernetesClient()
+            k8s_client = get_kubernetes_client()
             namespace = k8s_client.setup_user_namespace(user.id)
             logger.info(f"Created Kubernetes namespace {namespace} for user {user.id}")
         except Exception as e:
@@ -82,18 +126,58 @@ class UserService:
         Returns:
             UserResponse if authentication successful, None otherwise
         """
-        user = await self.repository.get_by_email(email)
-        if not user:
+        row = await self._get_login_row(email)
+        if not row:
             return None
 
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, row["password_hash"]):
             return None
 
-        return UserResponse.model_validate(user)
+        return _user_response(row)
+
+    async def _get_login_row(self, email: str) -> Optional[Mapping[str, Any]]:
+        """
+        Get a user's login columns by email, sharing one query between
+        concurrent callers for the same email.
+
+        Args:
+            email: User email
+
+        Returns:
+            Row mapping including password_hash if found, None otherwise
+        """
+        pending = _LOGIN_LOOKUPS.get(email)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The first caller was cancelled; fall through and query ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        _LOGIN_LOOKUPS[email] = future
+        try:
+            row = await self.repository.get_by_email_lite(email)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited failure isn't logged
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(row)
+            return row
+        finally:
+            if _LOGIN_LOOKUPS.get(email) is future:
+                del _LOGIN_LOOKUPS[email]
 
     async def get_user_by_id(self, user_id: int) -> Optional[UserResponse]:
         """
         Get a user by ID.
+        Results are cached in-process for a short TTL; concurrent misses for
+        the same user wait for the first lookup instead of querying again.
 
         Args:
             user_id: User ID
@@ -101,10 +185,34 @@ class UserService:
         Returns:
             UserResponse if found, None otherwise
         """
-        user = await self.repository.get_by_id(user_id)
-        if not user:
-            return None
-        return UserResponse.model_validate(user)
+        cached = _USER_CACHE.get(user_id)
+        if cached is not None:
+            return cached
+
+        lock, users = _USER_LOOKUP_LOCKS.get(user_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        _USER_LOOKUP_LOCKS[user_id] = (lock, users + 1)
+        try:
+            async with lock:
+                cached = _USER_CACHE.get(user_id)
+                if cached is not None:
+                    return cached
+
+                user = await self.repository.get_by_id(user_id)
+                if not user:
+                    return None
+                response = UserResponse.model_validate(user)
+                _USER_CACHE.set(user_id, response)
+                return response
+        finally:
+            # lock.locked() stays False until a woken waiter runs, so it
+            # cannot tell whether anyone is still queued; the count can
+            _, users = _USER_LOOKUP_LOCKS[user_id]
+            if users == 1:
+                del _USER_LOOKUP_LOCKS[user_id]
+            else:
+                _USER_LOOKUP_LOCKS[user_id] = (lock, users - 1)
 
     async def get_user_by_email(self, email: str) -> Optional[UserResponse]:
         """
@@ -116,10 +224,10 @@ class UserService:
         Returns:
             UserResponse if found, None otherwise
         """
-        user = await self.repository.get_by_email(email)
-        if not user:
+        row = await self.repository.get_by_email_lite(email)
+        if not row:
             return None
-        return UserResponse.model_validate(user)
+        return _user_response(row)
 
     def create_access_token_for_user(self, user: UserResponse) -> str:
         """
@@ -376,5 +376,5 @@ echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━
 echo -e "${GREEN}🎉 Starting FastAPI Server...${NC}"
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 echo ""
-exec "$VENV_PYTHON" -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+exec "$VENV_PYTHON" -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
 
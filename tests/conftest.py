@@ -11,7 +11,9 @@ from app.main import app
 from app.database import Base, get_db
 from app.models.user import User
 from app.models.model import Model, ModelVersion, Deployment
+from app.core.kubernetes_client import reset_kubernetes_client
 from app.core.security import get_password_hash
+from app.services.user_service import _USER_CACHE
 
 
 # Test database URL (in-memory SQLite for testing)
@@ -58,6 +60,10 @@ async def test_client(test_session):
         yield test_session
     
     app.dependency_overrides[get_db] = override_get_db
+    # Each test gets a fresh database, so drop users cached by earlier tests
+    _USER_CACHE.clear()
+    # Tests patch KubernetesClient, so don't reuse a client built by another test
+    reset_kubernetes_client()
     
     async with AsyncClient(
         transport=ASGITransport(app=app),
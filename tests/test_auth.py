@@ -186,6 +186,18 @@ class TestAuthenticationSadPath:
         
         assert response.status_code == 401
 
+    async def test_get_current_user_unknown_user(self, test_client: AsyncClient):
+        """Test a valid token for a user that does not exist is rejected."""
+        from app.core.security import create_access_token
+
+        token = create_access_token({"sub": "99999", "email": "ghost@example.com"})
+        response = await test_client.get(
+            "/api/v1/models",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 401
+
     async def test_get_current_user_malformed_header(self, test_client: AsyncClient):
         """Test accessing protected route with malformed Authorization header."""
         response = await test_client.get(
@@ -195,3 +207,139 @@ class TestAuthenticationSadPath:
         
         assert response.status_code == 403
 
+
+@pytest.mark.auth
+@pytest.mark.unit
+class TestTokenCache:
+    """Tests for the decoded JWT claims cache."""
+
+    def test_decode_access_token_cached(self):
+        """Test repeat decodes of the same token skip verification."""
+        from unittest.mock import patch
+        from app.core import security
+
+        token = security.create_access_token({"sub": "1", "email": "a@example.com"})
+        security._JWT_CACHE.clear()
+
+        with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as mock_decode:
+            first = security.decode_access_token(token)
+            second = security.decode_access_token(token)
+
+        assert first == second
+        assert first["sub"] == "1"
+        assert mock_decode.call_count == 1
+
+    def test_cache_entries_expire(self):
+        """Test TTL cache drops entries once they expire."""
+        from app.core.cache import TTLCache
+
+        now = [0.0]
+        cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=1)
+
+        now[0] = 5.0
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        cache.set("c", 3)
+        cache.set("d", 4)
+        assert cache.get("a") is None  # Evicted as least recently used
+        assert len(cache) == 2
+
+
+@pytest.mark.auth
+@pytest.mark.unit
+class TestUserCache:
+    """Tests for the cached user profile lookup."""
+
+    async def test_concurrent_misses_share_one_query(self):
+        """Test concurrent lookups of an uncached user issue a single query."""
+        import asyncio
+        from datetime import datetime, timezone
+        from types import SimpleNamespace
+        from unittest.mock import Mock
+        from app.models.user import UserRole
+        from app.services import user_service
+
+        now = datetime.now(timezone.utc)
+        row = SimpleNamespace(
+            id=987, email="cache@example.com", role=UserRole.USER, created_at=now, updated_at=now
+        )
+        calls = []
+
+        async def get_by_id(user_id):
+            calls.append(user_id)
+            await asyncio.sleep(0.01)
+            return row
+
+        user_service.invalidate_user_cache(987)
+        service = user_service.UserService(Mock())
+        service.repository = Mock(get_by_id=get_by_id)
+
+        results = await asyncio.gather(*(service.get_user_by_id(987) for _ in range(5)))
+
+        assert calls == [987]
+        assert all(result.email == "cache@example.com" for result in results)
+        assert 987 not in user_service._USER_LOOKUP_LOCKS
+        user_service.invalidate_user_cache(987)
+
+    async def test_lookup_lock_outlives_queued_waiters(self):
+        """Test the per-user lock entry stays until every queued lookup is done."""
+        import asyncio
+        from unittest.mock import Mock
+        from app.services import user_service
+
+        seen_locks = []
+
+        async def get_by_id(user_id):
+            # Unknown users are not cached, so each waiter queries in turn
+            seen_locks.append(user_service._USER_LOOKUP_LOCKS.get(user_id))
+            await asyncio.sleep(0.01)
+            return None
+
+        service = user_service.UserService(Mock())
+        service.repository = Mock(get_by_id=get_by_id)
+
+        results = await asyncio.gather(*(service.get_user_by_id(989) for _ in range(3)))
+
+        assert results == [None, None, None]
+        assert len(seen_locks) == 3
+        assert seen_locks[0] is not None
+        assert all(entry[0] is seen_locks[0][0] for entry in seen_locks)
+        assert 989 not in user_service._USER_LOOKUP_LOCKS
+
+    async def test_concurrent_logins_share_one_query(self):
+        """Test concurrent logins for the same email issue a single user query."""
+        import asyncio
+        from datetime import datetime, timezone
+        from unittest.mock import Mock
+        from app.core.security import get_password_hash
+        from app.models.user import UserRole
+        from app.services import user_service
+
+        now = datetime.now(timezone.utc)
+        row = {
+            "id": 988, "email": "burst@example.com", "role": UserRole.USER,
+            "created_at": now, "updated_at": now,
+            "password_hash": get_password_hash("correct-password"),
+        }
+        calls = []
+
+        async def get_by_email_lite(email):
+            calls.append(email)
+            await asyncio.sleep(0.01)
+            return row
+
+        service = user_service.UserService(Mock())
+        service.repository = Mock(get_by_email_lite=get_by_email_lite)
+
+        results = await asyncio.gather(
+            service.authenticate_user("burst@example.com", "correct-password"),
+            service.authenticate_user("burst@example.com", "wrong-password"),
+            service.authenticate_user("burst@example.com", "correct-password"),
+        )
+
+        assert calls == ["burst@example.com"]
+        assert [result is not None for result in results] == [True, False, True]
+        assert "burst@example.com" not in user_service._LOGIN_LOOKUPS
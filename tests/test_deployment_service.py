@@ -7,8 +7,10 @@ Tests cover:
 - Error handling and cleanup
 """
 
+import asyncio
+import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import AsyncMock, Mock, patch, MagicMock, call
 from pathlib import Path
 import subprocess
 
@@ -18,6 +20,14 @@ from app.models.model import ModelVersionStatus
 from app.schemas.model import DeploymentCreate
 
 
+def _mock_process(returncode: int, stdout: str = "", stderr: str = "") -> Mock:
+    """Build a stand-in for an asyncio subprocess with the given result."""
+    process = Mock()
+    process.returncode = returncode
+    process.communicate = AsyncMock(return_value=(stdout.encode(), stderr.encode()))
+    return process
+
+
 @pytest.mark.deployment
 @pytest.mark.unit
 class TestHelmDeploymentService:
@@ -29,14 +39,10 @@ class TestHelmDeploymentService:
         assert service.chart_path.exists() or service.chart_path.parent.exists()
         assert service.chart_path.name == "model-serving"
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_deploy_model_success(self, mock_subprocess):
+    @patch('app.services.deployment_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
+    async def test_deploy_model_success(self, mock_subprocess):
         """Test successful model deployment via Helm."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Release deployed successfully"
-        mock_result.stderr = ""
-        mock_subprocess.return_value = mock_result
+        mock_subprocess.return_value = _mock_process(0, "Release deployed successfully", "")
 
         service = HelmDeploymentService()
         
@@ -49,7 +55,7 @@ class TestHelmDeploymentService:
             mock_settings.INGRESS_HOST = "localhost"
             mock_settings.INGRESS_BASE_PATH = "/api/v1/predict"
 
-            result = service.deploy_model(
+            result = await service.deploy_model(
                 release_name="test-release",
                 namespace="user-1",
                 s3_path="s3://bucket/model.joblib",
@@ -66,20 +72,20 @@ class TestHelmDeploymentService:
             assert "localhost" in result["url"]
             mock_subprocess.assert_called_once()
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_deploy_model_helm_failure(self, mock_subprocess):
+    @patch('app.services.deployment_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
+    async def test_deploy_model_helm_failure(self, mock_subprocess):
         """Test deployment failure when Helm install fails."""
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Error: chart not found"
-        mock_subprocess.return_value = mock_result
+        mock_subprocess.return_value = _mock_process(1, "", "Error: chart not found")
 
         service = HelmDeploymentService()
         
-        with patch('app.services.deployment_service.settings'):
+        with patch('app.services.deployment_service.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.INGRESS_HOST = "localhost"
+            mock_settings.INGRESS_BASE_PATH = "/api/v1/predict"
+
             with pytest.raises(subprocess.SubprocessError):
-                service.deploy_model(
+                await service.deploy_model(
                     release_name="test-release",
                     namespace="user-1",
                     s3_path="s3://bucket/model.joblib",
@@ -89,75 +95,92 @@ class TestHelmDeploymentService:
                     s3_bucket="bucket"
                 )
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_undeploy_model_success(self, mock_subprocess):
+    @patch('app.services.deployment_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
+    async def test_undeploy_model_success(self, mock_subprocess):
         """Test successful model undeployment via Helm."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Release uninstalled"
-        mock_result.stderr = ""
-        mock_subprocess.return_value = mock_result
+        mock_subprocess.return_value = _mock_process(0, "Release uninstalled", "")
 
         service = HelmDeploymentService()
-        service.undeploy_model("test-release", "user-1")
+        await service.undeploy_model("test-release", "user-1")
 
         mock_subprocess.assert_called_once()
-        call_args = mock_subprocess.call_args[0][0]
+        call_args = mock_subprocess.call_args[0]
         assert "uninstall" in call_args
         assert "test-release" in call_args
         assert "user-1" in call_args
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_undeploy_model_not_found(self, mock_subprocess):
+    @patch('app.services.deployment_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
+    async def test_undeploy_model_not_found(self, mock_subprocess):
         """Test undeployment when release doesn't exist."""
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Error: release not found"
-        mock_subprocess.return_value = mock_result
+        mock_subprocess.return_value = _mock_process(1, "", "Error: release not found")
 
         service = HelmDeploymentService()
         # Should not raise exception if release not found
-        service.undeploy_model("test-release", "user-1")
+        await service.undeploy_model("test-release", "user-1")
+
+    async def test_helm_commands_are_capped(self):
+        """Test no more than the configured number of helm processes run at once."""
+        running = 0
+        peak = 0
+
+        async def communicate(input=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return b"", b""
+
+        async def spawn(*args, **kwargs):
+            process = Mock()
+            process.returncode = 0
+            process.communicate = communicate
+            return process
+
+        service = HelmDeploymentService()
+        with patch('app.services.deployment_service._HELM_SLOTS', asyncio.Semaphore(2)), \
+                patch('app.services.deployment_service.asyncio.create_subprocess_exec', side_effect=spawn):
+            await asyncio.gather(
+                *(service.undeploy_model(f"release-{i}", "user-1") for i in range(5))
+            )
+
+        assert peak == 2
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_get_deployment_status(self, mock_subprocess):
-        """Test getting deployment status."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = '{"status": "deployed"}'
-        mock_result.stderr = ""
-        mock_subprocess.return_value = mock_result
+    @patch('app.services.deployment_service.get_kubernetes_client')
+    async def test_get_deployment_status(self, mock_get_k8s):
+        """Test getting deployment status from the Kubernetes API."""
+        mock_k8s = Mock()
+        mock_k8s.get_release_deployment_status.return_value = {
+            "replicas": 2,
+            "ready_replicas": 2,
+            "available_replicas": 2,
+        }
+        mock_get_k8s.return_value = mock_k8s
 
         service = HelmDeploymentService()
-        status = service.get_deployment_status("test-release", "user-1")
+        status = await service.get_deployment_status("test-release", "user-1")
 
         assert status["status"] == "deployed"
-        mock_subprocess.assert_called_once()
+        assert status["ready_replicas"] == 2
+        mock_k8s.get_release_deployment_status.assert_called_once_with("user-1", "test-release")
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_get_deployment_status_not_found(self, mock_subprocess):
+    @patch('app.services.deployment_service.get_kubernetes_client')
+    async def test_get_deployment_status_not_found(self, mock_get_k8s):
         """Test getting status for non-existent deployment."""
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Error: release not found"
-        mock_subprocess.return_value = mock_result
+        mock_k8s = Mock()
+        mock_k8s.get_release_deployment_status.return_value = None
+        mock_get_k8s.return_value = mock_k8s
 
         service = HelmDeploymentService()
-        status = service.get_deployment_status("test-release", "user-1")
+        status = await service.get_deployment_status("test-release", "user-1")
 
         assert status["status"] == "not_found"
         assert "error" in status
 
-    @patch('app.services.deployment_service.subprocess.run')
-    def test_deploy_model_with_custom_ingress_path(self, mock_subprocess):
+    @patch('app.services.deployment_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
+    async def test_deploy_model_with_custom_ingress_path(self, mock_subprocess):
         """Test deployment with custom ingress path."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Release deployed"
-        mock_result.stderr = ""
-        mock_subprocess.return_value = mock_result
+        mock_subprocess.return_value = _mock_process(0, "Release deployed", "")
 
         service = HelmDeploymentService()
         
@@ -166,7 +189,7 @@ class TestHelmDeploymentService:
             mock_settings.INGRESS_HOST = "localhost"
             mock_settings.INGRESS_BASE_PATH = "/api/v1/predict"
 
-            result = service.deploy_model(
+            result = await service.deploy_model(
                 release_name="test-release",
                 namespace="user-1",
                 s3_path="s3://bucket/model.joblib",
@@ -178,9 +201,13 @@ class TestHelmDeploymentService:
             )
 
             assert "/api/v1/predict/123" in result["url"]
-            # Verify ingress path was passed to Helm
-            call_args = mock_subprocess.call_args[0][0]
-            assert any("ingress.hosts[0].paths[0].path=/api/v1/predict/123" in str(arg) for arg in call_args)
+            # Verify ingress path was passed to Helm in the values on stdin
+            call_args = mock_subprocess.call_args[0]
+            assert call_args[-2:] == ("--values", "-")
+            values = json.loads(mock_subprocess.return_value.communicate.call_args[0][0])
+            assert values["ingress"]["hosts"][0]["paths"][0]["path"] == "/api/v1/predict/123"
+            assert values["model"]["s3SecretKey"] == "minioadmin"
+            assert not any("minioadmin" in str(arg) for arg in call_args)
 
 
 @pytest.mark.deployment
@@ -207,7 +234,7 @@ class TestDeploymentServiceIntegration:
         )
 
         with patch('app.services.model_service.HelmDeploymentService') as mock_helm_class:
-            mock_helm_service = Mock()
+            mock_helm_service = AsyncMock()
             mock_helm_class.return_value = mock_helm_service
             mock_helm_service.deploy_model.return_value = {
                 "release_name": "test-release",
@@ -242,7 +269,7 @@ class TestDeploymentServiceIntegration:
         )
 
         with patch('app.services.model_service.HelmDeploymentService') as mock_helm_class:
-            mock_helm_service = Mock()
+            mock_helm_service = AsyncMock()
             mock_helm_class.return_value = mock_helm_service
             mock_helm_service.deploy_model.side_effect = Exception("Helm install failed")
 
@@ -298,7 +325,7 @@ class TestDeploymentServiceIntegration:
         await test_session.commit()
 
         with patch('app.services.model_service.HelmDeploymentService') as mock_helm_class:
-            mock_helm_service = Mock()
+            mock_helm_service = AsyncMock()
             mock_helm_class.return_value = mock_helm_service
 
             service = DeploymentService(test_session)
@@ -324,7 +351,7 @@ class TestDeploymentServiceIntegration:
         await test_session.commit()
 
         with patch('app.services.model_service.HelmDeploymentService') as mock_helm_class:
-            mock_helm_service = Mock()
+            mock_helm_service = AsyncMock()
             mock_helm_class.return_value = mock_helm_service
             mock_helm_service.undeploy_model.side_effect = Exception("Helm uninstall failed")
 
@@ -358,7 +385,7 @@ class TestDeploymentServiceIntegration:
         )
 
         with patch('app.services.model_service.HelmDeploymentService') as mock_helm_class:
-            mock_helm_service = Mock()
+            mock_helm_service = AsyncMock()
             mock_helm_class.return_value = mock_helm_service
             mock_helm_service.deploy_model.return_value = {
                 "release_name": "test-release",
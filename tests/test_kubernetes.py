@@ -8,6 +8,10 @@ Tests cover:
 - User namespace setup integration
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from kubernetes.client.rest import ApiException
@@ -37,6 +41,11 @@ class TestKubernetesClient:
             mock_config.load_kube_config.assert_called_once()
             assert k8s_client.core_v1 == mock_core_v1
             assert k8s_client.networking_v1 == mock_networking_v1
+            # Both API groups share a single ApiClient
+            mock_client_module.ApiClient.assert_called_once()
+            api_client = mock_client_module.ApiClient.return_value
+            mock_client_module.CoreV1Api.assert_called_once_with(api_client)
+            mock_client_module.NetworkingV1Api.assert_called_once_with(api_client)
 
     @patch('app.core.kubernetes_client.config')
     @patch('app.core.kubernetes_client.client')
@@ -54,6 +63,35 @@ class TestKubernetesClient:
 
             mock_config.load_kube_config.assert_called_once_with(config_file="/custom/path/kubeconfig")
 
+    @patch('app.core.kubernetes_client.config')
+    def test_client_initialization_with_injected_apis(self, mock_config):
+        """Test injected API objects are reused without loading kubeconfig."""
+        core_v1 = Mock()
+        networking_v1 = Mock()
+
+        k8s_client = KubernetesClient(core_v1=core_v1, networking_v1=networking_v1)
+
+        mock_config.load_kube_config.assert_not_called()
+        assert k8s_client.core_v1 is core_v1
+        assert k8s_client.networking_v1 is networking_v1
+
+    @patch('app.core.kubernetes_client.config')
+    @patch('app.core.kubernetes_client.client')
+    def test_get_kubernetes_client_is_shared(self, mock_client_module, mock_config):
+        """Test the shared client is built once and reused."""
+        from app.core.kubernetes_client import get_kubernetes_client, reset_kubernetes_client
+
+        reset_kubernetes_client()
+        try:
+            with patch('app.core.kubernetes_client.settings'):
+                first = get_kubernetes_client()
+                second = get_kubernetes_client()
+
+            assert first is second
+            mock_config.load_kube_config.assert_called_once()
+        finally:
+            reset_kubernetes_client()
+
     @patch('app.core.kubernetes_client.config')
     @patch('app.core.kubernetes_client.client')
     def test_namespace_exists_true(self, mock_client_module, mock_config):
@@ -86,6 +124,26 @@ class TestKubernetesClient:
 
             assert exists is False
 
+    @patch('app.core.kubernetes_client.config')
+    @patch('app.core.kubernetes_client.client')
+    def test_namespace_exists_cached(self, mock_client_module, mock_config):
+        """Test namespace_exists caches negative lookups."""
+        mock_core_v1 = Mock()
+        mock_core_v1.read_namespace.side_effect = ApiException(status=404)
+        mock_client_module.CoreV1Api.return_value = mock_core_v1
+        mock_client_module.NetworkingV1Api.return_value = Mock()
+
+        with patch('app.core.kubernetes_client.settings'):
+            k8s_client = KubernetesClient()
+            assert k8s_client.namespace_exists("user-1") is False
+            assert k8s_client.namespace_exists("user-1") is False
+            mock_core_v1.read_namespace.assert_called_once()
+
+            # Creating the namespace refreshes the cached answer
+            k8s_client.create_namespace("user-1")
+            assert k8s_client.namespace_exists("user-1") is True
+            mock_core_v1.read_namespace.assert_called_once()
+
     @patch('app.core.kubernetes_client.config')
     @patch('app.core.kubernetes_client.client')
     def test_create_namespace_success(self, mock_client_module, mock_config):
@@ -109,16 +167,18 @@ class TestKubernetesClient:
     def test_create_namespace_already_exists(self, mock_client_module, mock_config):
         """Test namespace creation when namespace already exists."""
         mock_core_v1 = Mock()
-        mock_core_v1.read_namespace.return_value = Mock()  # Exists
+        mock_core_v1.create_namespace.side_effect = ApiException(status=409)  # Exists
         mock_client_module.CoreV1Api.return_value = mock_core_v1
         mock_client_module.NetworkingV1Api.return_value = Mock()
 
         with patch('app.core.kubernetes_client.settings'):
             k8s_client = KubernetesClient()
+            # Should treat the 409 conflict as success
             k8s_client.create_namespace("user-1")
 
-            # Should not call create_namespace if it already exists
-            mock_core_v1.create_namespace.assert_not_called()
+            # Should go straight to create without a separate existence check
+            mock_core_v1.create_namespace.assert_called_once()
+            mock_core_v1.read_namespace.assert_not_called()
 
     @patch('app.core.kubernetes_client.config')
     @patch('app.core.kubernetes_client.client')
@@ -189,6 +249,9 @@ class TestKubernetesClient:
             mock_networking_v1.create_namespaced_network_policy.assert_called_once()
             call_args = mock_networking_v1.create_namespaced_network_policy.call_args
             assert call_args[1]['namespace'] == "user-1"
+            body = call_args[1]['body']
+            assert body["metadata"]["namespace"] == "user-1"
+            assert body["spec"]["egress"][1]["ports"][0]["port"] == 9000
 
     @patch('app.core.kubernetes_client.config')
     @patch('app.core.kubernetes_client.client')
@@ -225,6 +288,89 @@ class TestKubernetesClient:
             mock_core_v1.create_namespaced_resource_quota.assert_called_once()
             mock_networking_v1.create_namespaced_network_policy.assert_called_once()
 
+    @patch('app.core.kubernetes_client.config')
+    @patch('app.core.kubernetes_client.client')
+    def test_setup_user_namespaces_bulk(self, mock_client_module, mock_config):
+        """Test bulk setup dedupes IDs and isolates per-user failures."""
+        mock_client_module.CoreV1Api.return_value = Mock()
+        mock_client_module.NetworkingV1Api.return_value = Mock()
+
+        with patch('app.core.kubernetes_client.settings'):
+            k8s_client = KubernetesClient()
+
+            def fake_setup(user_id, minio_endpoint=None):
+                if user_id == 2:
+                    raise ApiException(status=500)
+                return f"user-{user_id}"
+
+            with patch.object(k8s_client, "setup_user_namespace", side_effect=fake_setup) as mock_setup:
+                results = k8s_client.setup_user_namespaces_bulk([1, 2, 1, 3])
+
+            assert mock_setup.call_count == 3
+            assert [r["user_id"] for r in results] == [1, 2, 3]
+            assert results[0] == {"user_id": 1, "namespace": "user-1", "error": None}
+            assert results[1]["namespace"] is None
+            assert results[1]["error"] is not None
+            assert results[2]["namespace"] == "user-3"
+
+    @patch('app.core.kubernetes_client.config')
+    @patch('app.core.kubernetes_client.client')
+    def test_setup_user_namespace_coalesces_concurrent_calls(self, mock_client_module, mock_config):
+        """Test concurrent setups for one user share a single in-flight call."""
+        mock_client_module.CoreV1Api.return_value = Mock()
+        mock_client_module.NetworkingV1Api.return_value = Mock()
+
+        with patch('app.core.kubernetes_client.settings'):
+            k8s_client = KubernetesClient()
+            started = threading.Event()
+            release = threading.Event()
+
+            def slow_setup(user_id, minio_endpoint=None):
+                started.set()
+                release.wait(timeout=5)
+                return f"user-{user_id}"
+
+            with patch.object(k8s_client, "_setup_user_namespace", side_effect=slow_setup) as mock_setup:
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    first = pool.submit(k8s_client.setup_user_namespace, 1)
+                    started.wait(timeout=5)
+                    others = [pool.submit(k8s_client.setup_user_namespace, 1) for _ in range(3)]
+                    # Give the followers time to attach to the in-flight future
+                    time.sleep(0.1)
+                    release.set()
+                    results = [first.result()] + [f.result() for f in others]
+
+            assert results == ["user-1"] * 4
+            assert mock_setup.call_count == 1
+            assert k8s_client._ns_setup_futures == {}
+
+    @patch('app.core.kubernetes_client.config')
+    @patch('app.core.kubernetes_client.client')
+    def test_get_release_deployment_status(self, mock_client_module, mock_config):
+        """Test release status is read from the Deployment by instance label."""
+        mock_apps_v1 = Mock()
+        deployment = Mock()
+        deployment.spec.replicas = 2
+        deployment.status.ready_replicas = 1
+        deployment.status.available_replicas = None
+        mock_apps_v1.list_namespaced_deployment.return_value = Mock(items=[deployment])
+        mock_client_module.CoreV1Api.return_value = Mock()
+        mock_client_module.NetworkingV1Api.return_value = Mock()
+        mock_client_module.AppsV1Api.return_value = mock_apps_v1
+
+        with patch('app.core.kubernetes_client.settings'):
+            k8s_client = KubernetesClient()
+            status = k8s_client.get_release_deployment_status("user-1", "release-1")
+
+            assert status == {"replicas": 2, "ready_replicas": 1, "available_replicas": 0}
+            mock_apps_v1.list_namespaced_deployment.assert_called_once_with(
+                namespace="user-1",
+                label_selector="app.kubernetes.io/instance=release-1"
+            )
+
+            mock_apps_v1.list_namespaced_deployment.return_value = Mock(items=[])
+            assert k8s_client.get_release_deployment_status("user-1", "missing") is None
+
     @patch('app.core.kubernetes_client.config')
     @patch('app.core.kubernetes_client.client')
     def test_delete_namespace_success(self, mock_client_module, mock_config):
@@ -5,7 +5,7 @@ Tests both happy path and sad path scenarios.
 
 import pytest
 from httpx import AsyncClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from app.models.user import User
 from app.models.model import Model, ModelVersion, Deployment
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -53,6 +53,51 @@ class TestModelRegistryHappyPath:
         assert len(data) >= 1
         assert any(model["id"] == test_model.id for model in data)
 
+    async def test_get_all_models_paginated(
+        self, test_client: AsyncClient, auth_headers: dict
+    ):
+        """Test offset/limit pagination on the model list."""
+        for i in range(3):
+            await test_client.post(
+                "/api/v1/models",
+                headers=auth_headers,
+                json={"name": f"Model {i}", "type": "sklearn"},
+            )
+
+        response = await test_client.get(
+            "/api/v1/models?offset=1&limit=1",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["name"] == "Model 1"
+
+    async def test_get_all_models_keyset_cursor(
+        self, test_client: AsyncClient, auth_headers: dict
+    ):
+        """Test walking the model list with the next-page cursor."""
+        for i in range(3):
+            await test_client.post(
+                "/api/v1/models",
+                headers=auth_headers,
+                json={"name": f"Model {i}", "type": "sklearn"},
+            )
+
+        first = await test_client.get("/api/v1/models?limit=2", headers=auth_headers)
+        assert first.status_code == 200
+        assert [m["name"] for m in first.json()] == ["Model 0", "Model 1"]
+        cursor = first.headers["X-Next-Cursor"]
+        assert cursor == str(first.json()[-1]["id"])
+
+        second = await test_client.get(
+            f"/api/v1/models?limit=2&after={cursor}", headers=auth_headers
+        )
+        assert second.status_code == 200
+        assert [m["name"] for m in second.json()] == ["Model 2"]
+        assert "X-Next-Cursor" not in second.headers
+
     async def test_get_model_by_id(
         self, test_client: AsyncClient, auth_headers: dict, test_model: Model
     ):
@@ -141,7 +186,7 @@ class TestModelRegistryHappyPath:
     ):
         """Test successful deployment creation."""
         # Mock Helm deployment service
-        mock_helm_service = Mock()
+        mock_helm_service = AsyncMock()
         mock_helm_class.return_value = mock_helm_service
         mock_helm_service.deploy_model.return_value = {
             "release_name": f"model-{test_model_version.model_id}-{test_model_version.id}-model-serving",
@@ -178,6 +223,15 @@ class TestModelRegistryHappyPath:
         assert "k8s_service_name" in data
         assert "id" in data
 
+        # A second deployment created immediately after gets a distinct service name
+        second = await test_client.post(
+            f"/api/v1/versions/{test_model_version.id}/deployments",
+            headers=auth_headers,
+            json={"replicas": 1},
+        )
+        assert second.status_code == 201
+        assert second.json()["k8s_service_name"] != data["k8s_service_name"]
+
     async def test_get_deployments(
         self, test_client: AsyncClient, auth_headers: dict, test_model_version: ModelVersion, test_deployment: Deployment
     ):
@@ -192,13 +246,76 @@ class TestModelRegistryHappyPath:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    async def test_create_versions_in_bulk(self, test_session: AsyncSession, test_model: Model):
+        """Test creating several versions with a single insert."""
+        from app.models.model import ModelVersionStatus
+        from app.repositories.model_repository import ModelVersionRepository
+        from app.schemas.model import ModelVersionCreate
+
+        repository = ModelVersionRepository(test_session)
+        created = await repository.create_many(
+            [
+                ModelVersionCreate(model_id=test_model.id, version_tag=tag, s3_path=f"s3://bucket/{tag}")
+                for tag in ("bulk-1", "bulk-2", "bulk-3")
+            ]
+        )
+        await test_session.commit()
+
+        assert [version.version_tag for version in created] == ["bulk-1", "bulk-2", "bulk-3"]
+        assert all(version.id is not None for version in created)
+        assert all(version.status == ModelVersionStatus.BUILDING for version in created)
+        assert await repository.create_many([]) == []
+
+    async def test_version_ownership_lookup_reused_within_session(
+        self, test_session: AsyncSession, test_model_version: ModelVersion, test_user: User
+    ):
+        """Test repeated ownership checks for a version issue one query."""
+        from sqlalchemy import event
+        from app.repositories.model_repository import ModelVersionRepository
+
+        statements = []
+        engine = test_session.bind.sync_engine
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        repository = ModelVersionRepository(test_session)
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            first = await repository.get_by_id_with_owner(test_model_version.id)
+            second = await repository.get_by_id_with_owner(test_model_version.id)
+            with_model = await repository.get_by_id_with_model(test_model_version.id, test_user.id)
+            other_user = await repository.get_by_id_with_model(test_model_version.id, test_user.id + 1)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert first == second == (test_model_version, test_user.id)
+        assert with_model[0] is test_model_version
+        assert other_user is None
+        assert len(statements) == 1
+
+    async def test_get_deployments_by_service_names(
+        self, test_session: AsyncSession, test_deployment: Deployment
+    ):
+        """Test batch lookup of deployments by Kubernetes service name."""
+        from app.repositories.model_repository import DeploymentRepository
+
+        repository = DeploymentRepository(test_session)
+        found = await repository.get_by_k8s_service_names(
+            [test_deployment.k8s_service_name, "model-missing", test_deployment.k8s_service_name]
+        )
+
+        assert list(found) == [test_deployment.k8s_service_name]
+        assert found[test_deployment.k8s_service_name].id == test_deployment.id
+        assert await repository.get_by_k8s_service_names([]) == {}
+
     @patch('app.services.model_service.HelmDeploymentService')
     async def test_delete_deployment(
         self, mock_helm_class, test_client: AsyncClient, auth_headers: dict, test_deployment: Deployment
     ):
         """Test deleting a deployment."""
         # Mock Helm undeploy service
-        mock_helm_service = Mock()
+        mock_helm_service = AsyncMock()
         mock_helm_class.return_value = mock_helm_service
         
         response = await test_client.delete(
@@ -378,6 +495,17 @@ class TestModelRegistrySadPath:
         
         assert response.status_code == 422  # Validation error
 
+    async def test_get_models_limit_too_large(
+        self, test_client: AsyncClient, auth_headers: dict
+    ):
+        """Test that page size is capped."""
+        response = await test_client.get(
+            "/api/v1/models?limit=1000",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422  # Validation error
+
     async def test_create_deployment_invalid_replicas(
         self, test_client: AsyncClient, auth_headers: dict, test_model_version: ModelVersion
     ):
@@ -398,3 +526,22 @@ class TestModelRegistrySadPath:
         
         assert response.status_code == 422  # Validation error
 
+
+@pytest.mark.models
+@pytest.mark.unit
+class TestRelationshipLoading:
+    """Guard rails for ORM relationship loading in async code."""
+
+    def test_relationships_raise_on_lazy_load(self):
+        """Test every relationship refuses implicit lazy loads."""
+        from sqlalchemy import inspect
+        from app.database import Base
+
+        relationships = [
+            (mapper.class_.__name__, rel.key, rel.lazy)
+            for mapper in Base.registry.mappers
+            for rel in inspect(mapper.class_).relationships
+        ]
+
+        assert relationships
+        assert [r for r in relationships if r[2] != "raise_on_sql"] == []
@@ -8,12 +8,14 @@ Tests cover:
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
+from unittest.mock import ANY, Mock, AsyncMock, patch, MagicMock
 from io import BytesIO
 from fastapi import UploadFile
 from minio.error import S3Error
 
+from app.core.dependencies import get_storage
 from app.core.storage import StorageClient
+from app.main import app
 from app.services.storage_service import StorageService
 from app.models.model import ModelVersionStatus
 
@@ -23,6 +25,13 @@ from app.models.model import ModelVersionStatus
 class TestStorageClient:
     """Tests for StorageClient (Minio wrapper)."""
 
+    @pytest.fixture(autouse=True)
+    def reset_checked_buckets(self):
+        """Start each test with no buckets marked as verified."""
+        StorageClient._checked_buckets.clear()
+        yield
+        StorageClient._checked_buckets.clear()
+
     @patch('app.core.storage.Minio')
     def test_storage_client_initialization(self, mock_minio_class):
         """Test StorageClient initializes Minio client correctly."""
@@ -47,6 +56,10 @@ class TestStorageClient:
             )
             mock_minio_instance.bucket_exists.assert_called_once_with("kubeserve-models")
 
+            # A second client in the same process skips the bucket check
+            StorageClient()
+            mock_minio_instance.bucket_exists.assert_called_once_with("kubeserve-models")
+
     @patch('app.core.storage.Minio')
     def test_storage_client_creates_bucket_if_not_exists(self, mock_minio_class):
         """Test StorageClient creates bucket if it doesn't exist."""
@@ -86,6 +99,29 @@ class TestStorageClient:
             assert s3_path == "s3://kubeserve-models/models/1/test/v1/model.joblib"
             mock_minio_instance.put_object.assert_called_once()
 
+    @patch('app.core.storage.Minio')
+    def test_upload_stream_success(self, mock_minio_class):
+        """Test streamed upload passes the file object straight to Minio."""
+        mock_minio_instance = Mock()
+        mock_minio_class.return_value = mock_minio_instance
+        mock_minio_instance.bucket_exists.return_value = True
+
+        with patch('app.core.storage.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.MINIO_ACCESS_KEY = "minioadmin"
+            mock_settings.MINIO_SECRET_KEY = "minioadmin"
+            mock_settings.MINIO_USE_SSL = False
+            mock_settings.MINIO_BUCKET_NAME = "kubeserve-models"
+
+            client = StorageClient()
+            stream = BytesIO(b"test file content")
+            s3_path = client.upload_stream("models/1/test/v1/model.joblib", stream, 17)
+
+            assert s3_path == "s3://kubeserve-models/models/1/test/v1/model.joblib"
+            args, kwargs = mock_minio_instance.put_object.call_args
+            assert args[2] is stream
+            assert kwargs["length"] == 17
+
     @patch('app.core.storage.Minio')
     def test_upload_file_failure(self, mock_minio_class):
         """Test file upload failure handling."""
@@ -122,6 +158,59 @@ class TestStorageClient:
 
             assert "Failed to upload file" in str(exc_info.value)
 
+    @patch('app.core.storage.Minio')
+    def test_get_file_stream(self, mock_minio_class):
+        """Test streamed download yields chunks and releases the connection."""
+        mock_minio_instance = Mock()
+        mock_minio_class.return_value = mock_minio_instance
+        mock_minio_instance.bucket_exists.return_value = True
+        mock_response = Mock()
+        mock_response.stream.return_value = iter([b"abc", b"def"])
+        mock_minio_instance.get_object.return_value = mock_response
+
+        with patch('app.core.storage.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.MINIO_ACCESS_KEY = "minioadmin"
+            mock_settings.MINIO_SECRET_KEY = "minioadmin"
+            mock_settings.MINIO_USE_SSL = False
+            mock_settings.MINIO_BUCKET_NAME = "kubeserve-models"
+
+            client = StorageClient()
+            chunks = list(client.get_file_stream("models/1/test/v1/model.joblib"))
+
+            assert chunks == [b"abc", b"def"]
+            mock_response.close.assert_called_once()
+            mock_response.release_conn.assert_called_once()
+
+    @patch('app.core.storage.Minio')
+    def test_get_file_bytes_failure(self, mock_minio_class):
+        """Test failed download does not touch an unset response."""
+        mock_minio_instance = Mock()
+        mock_minio_class.return_value = mock_minio_instance
+        mock_minio_instance.bucket_exists.return_value = True
+        mock_minio_instance.get_object.side_effect = S3Error(
+            code="NoSuchKey",
+            message="Not found",
+            resource="resource",
+            request_id="request_id",
+            host_id="host_id",
+            response=Mock()
+        )
+
+        with patch('app.core.storage.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.MINIO_ACCESS_KEY = "minioadmin"
+            mock_settings.MINIO_SECRET_KEY = "minioadmin"
+            mock_settings.MINIO_USE_SSL = False
+            mock_settings.MINIO_BUCKET_NAME = "kubeserve-models"
+
+            client = StorageClient()
+
+            with pytest.raises(S3Error) as exc_info:
+                client.get_file_bytes("models/1/test/v1/model.joblib")
+
+            assert "Failed to get file" in str(exc_info.value)
+
     @patch('app.core.storage.Minio')
     def test_file_exists(self, mock_minio_class):
         """Test file existence check."""
@@ -142,6 +231,28 @@ class TestStorageClient:
 
             assert exists is True
 
+    @patch('app.core.storage.Minio')
+    def test_get_metadata(self, mock_minio_class):
+        """Test a user metadata value is read from the object's headers."""
+        mock_minio_instance = Mock()
+        mock_minio_class.return_value = mock_minio_instance
+        mock_minio_instance.bucket_exists.return_value = True
+        mock_minio_instance.stat_object.return_value = Mock(
+            metadata={"x-amz-meta-sha256": "ab" * 32}
+        )
+
+        with patch('app.core.storage.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.MINIO_ACCESS_KEY = "minioadmin"
+            mock_settings.MINIO_SECRET_KEY = "minioadmin"
+            mock_settings.MINIO_USE_SSL = False
+            mock_settings.MINIO_BUCKET_NAME = "kubeserve-models"
+
+            client = StorageClient()
+
+            assert client.get_metadata("models/1/test/v1/model.joblib", "sha256") == "ab" * 32
+            assert client.get_metadata("models/1/test/v1/model.joblib", "other") is None
+
     @patch('app.core.storage.Minio')
     def test_file_not_exists(self, mock_minio_class):
         """Test file non-existence check."""
@@ -172,6 +283,74 @@ class TestStorageClient:
 
             assert exists is False
 
+    @patch('app.core.storage.Minio')
+    def test_file_exists_error_not_cached(self, mock_minio_class):
+        """Test a failed existence check reports a miss without caching it."""
+        mock_minio_instance = Mock()
+        mock_minio_class.return_value = mock_minio_instance
+        mock_minio_instance.bucket_exists.return_value = True
+        mock_minio_instance.stat_object.side_effect = [
+            S3Error(
+                code="AccessDenied",
+                message="Access denied",
+                resource="resource",
+                request_id="request_id",
+                host_id="host_id",
+                response=Mock()
+            ),
+            Mock(),
+        ]
+
+        with patch('app.core.storage.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.MINIO_ACCESS_KEY = "minioadmin"
+            mock_settings.MINIO_SECRET_KEY = "minioadmin"
+            mock_settings.MINIO_USE_SSL = False
+            mock_settings.MINIO_BUCKET_NAME = "kubeserve-models"
+
+            client = StorageClient()
+
+            assert client.file_exists("models/1/test/v1/model.joblib") is False
+            assert client.file_exists("models/1/test/v1/model.joblib") is True
+
+    @patch('app.core.storage.Minio')
+    def test_exists_many_caches_results(self, mock_minio_class):
+        """Test batched existence checks dedupe names and reuse cached results."""
+        mock_minio_instance = Mock()
+        mock_minio_class.return_value = mock_minio_instance
+        mock_minio_instance.bucket_exists.return_value = True
+
+        def fake_stat(bucket, name):
+            if name == "missing":
+                raise S3Error(
+                    code="NoSuchKey",
+                    message="Not found",
+                    resource="resource",
+                    request_id="request_id",
+                    host_id="host_id",
+                    response=Mock()
+                )
+            return Mock()
+
+        mock_minio_instance.stat_object.side_effect = fake_stat
+
+        with patch('app.core.storage.settings') as mock_settings:
+            mock_settings.MINIO_ENDPOINT = "localhost:9000"
+            mock_settings.MINIO_ACCESS_KEY = "minioadmin"
+            mock_settings.MINIO_SECRET_KEY = "minioadmin"
+            mock_settings.MINIO_USE_SSL = False
+            mock_settings.MINIO_BUCKET_NAME = "kubeserve-models"
+
+            client = StorageClient()
+            result = client.exists_many(["a", "missing", "a", "b"])
+
+            assert result == {"a": True, "missing": False, "b": True}
+            assert mock_minio_instance.stat_object.call_count == 3
+
+            # Second lookup is served from the cache
+            assert client.file_exists("missing") is False
+            assert mock_minio_instance.stat_object.call_count == 3
+
 
 @pytest.mark.asyncio
 @pytest.mark.storage
@@ -284,7 +463,7 @@ class TestStorageService:
         )
 
         # Mock storage client methods
-        mock_storage_client.upload_file.side_effect = [
+        mock_storage_client.upload_stream.side_effect = [
             "s3://kubeserve-models/models/1/test_model/v1/model.joblib",
             "s3://kubeserve-models/models/1/test_model/v1/requirements.txt"
         ]
@@ -295,14 +474,16 @@ class TestStorageService:
             version_tag="v1",
             model_file=model_file,
             requirements_file=requirements_file,
+            model_size=13,
+            requirements_size=12,
         )
 
         assert model_path == "s3://kubeserve-models/models/1/test_model/v1/model.joblib"
         assert requirements_path == "s3://kubeserve-models/models/1/test_model/v1/requirements.txt"
-        assert mock_storage_client.upload_file.call_count == 2
+        assert mock_storage_client.upload_stream.call_count == 2
 
-    async def test_upload_model_artifacts_file_too_large(self, mock_storage_client):
-        """Test upload rejects file that's too large."""
+    async def test_validate_artifacts_file_too_large(self, mock_storage_client):
+        """Test validation rejects file that's too large."""
         from fastapi import HTTPException
 
         service = StorageService()
@@ -319,17 +500,21 @@ class TestStorageService:
         )
 
         with pytest.raises(HTTPException) as exc_info:
-            await service.upload_model_artifacts(
-                user_id=1,
-                model_name="Test Model",
-                version_tag="v1",
-                model_file=model_file,
-                requirements_file=requirements_file,
-            )
+            service.validate_artifacts(model_file, requirements_file)
 
         assert exc_info.value.status_code == 400
         assert "too large" in exc_info.value.detail.lower()
 
+    async def test_validate_artifacts_returns_sizes(self, mock_storage_client):
+        """Test validation measures both files and leaves them rewound."""
+        service = StorageService()
+        model_file = UploadFile(filename="model.joblib", file=BytesIO(b"model content"))
+        requirements_file = UploadFile(filename="requirements.txt", file=BytesIO(b"numpy==1.0.0"))
+
+        assert service.validate_artifacts(model_file, requirements_file) == (13, 12)
+        assert model_file.file.tell() == 0
+        assert requirements_file.file.tell() == 0
+
     async def test_upload_model_artifacts_s3_error(self, mock_storage_client):
         """Test upload handles S3 errors."""
         from fastapi import HTTPException
@@ -348,7 +533,7 @@ class TestStorageService:
         # Mock S3 error
         error_response = Mock()
         error_response.status = 500
-        mock_storage_client.upload_file.side_effect = S3Error(
+        mock_storage_client.upload_stream.side_effect = S3Error(
             code="ConnectionError",
             message="Connection failed",
             resource="resource",
@@ -364,11 +549,171 @@ class TestStorageService:
                 version_tag="v1",
                 model_file=model_file,
                 requirements_file=requirements_file,
+                model_size=13,
+                requirements_size=12,
             )
 
         assert exc_info.value.status_code == 500
         assert "storage" in exc_info.value.detail.lower()
 
+    async def test_upload_model_artifacts_partial_failure_cleans_up(self, mock_storage_client):
+        """Test the uploaded model file is removed when the requirements upload fails."""
+        from fastapi import HTTPException
+
+        service = StorageService()
+
+        model_file = UploadFile(
+            filename="model.joblib",
+            file=BytesIO(b"model content")
+        )
+        requirements_file = UploadFile(
+            filename="requirements.txt",
+            file=BytesIO(b"numpy==1.0.0")
+        )
+
+        error_response = Mock()
+        error_response.status = 500
+
+        def upload_stream(object_name, *args, **kwargs):
+            if object_name.endswith("requirements.txt"):
+                raise S3Error(
+                    code="ConnectionError",
+                    message="Connection failed",
+                    resource="resource",
+                    request_id="request_id",
+                    host_id="host_id",
+                    response=error_response
+                )
+            return f"s3://kubeserve-models/{object_name}"
+
+        mock_storage_client.upload_stream.side_effect = upload_stream
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.upload_model_artifacts(
+                user_id=1,
+                model_name="Test Model",
+                version_tag="v1",
+                model_file=model_file,
+                requirements_file=requirements_file,
+                model_size=13,
+                requirements_size=12,
+            )
+
+        assert exc_info.value.status_code == 500
+        mock_storage_client.delete_file.assert_called_once_with(
+            "models/1/test_model/v1/model.joblib"
+        )
+
+    async def test_model_file_sha256(self, mock_storage_client):
+        """Test the model file digest is computed and the file left rewound."""
+        import hashlib
+
+        service = StorageService()
+        content = b"model content" * 100_000
+        model_file = UploadFile(filename="model.joblib", file=BytesIO(content))
+
+        digest = await service.model_file_sha256(model_file)
+
+        assert digest == hashlib.sha256(content).hexdigest()
+        assert model_file.file.tell() == 0
+
+    async def test_upload_model_artifacts_copies_known_model(self, mock_storage_client):
+        """Test a model file with a stored twin is copied server-side, not uploaded."""
+        service = StorageService()
+        mock_storage_client.bucket_name = "kubeserve-models"
+        mock_storage_client.get_metadata.return_value = "ab" * 32
+        mock_storage_client.copy_file.return_value = (
+            "s3://kubeserve-models/models/1/test_model/v2/model.joblib"
+        )
+        mock_storage_client.upload_stream.return_value = (
+            "s3://kubeserve-models/models/1/test_model/v2/requirements.txt"
+        )
+
+        model_path, _ = await service.upload_model_artifacts(
+            user_id=1,
+            model_name="Test Model",
+            version_tag="v2",
+            model_file=UploadFile(filename="model.joblib", file=BytesIO(b"model content")),
+            requirements_file=UploadFile(filename="requirements.txt", file=BytesIO(b"numpy")),
+            model_size=13,
+            requirements_size=5,
+            model_sha256="ab" * 32,
+            model_source="s3://kubeserve-models/models/1/test_model/v1/model.joblib",
+        )
+
+        assert model_path == "s3://kubeserve-models/models/1/test_model/v2/model.joblib"
+        mock_storage_client.get_metadata.assert_called_once_with(
+            "models/1/test_model/v1/model.joblib", "sha256"
+        )
+        mock_storage_client.copy_file.assert_called_once_with(
+            "models/1/test_model/v1/model.joblib", "models/1/test_model/v2/model.joblib"
+        )
+        mock_storage_client.upload_stream.assert_called_once()
+        assert mock_storage_client.upload_stream.call_args[0][0].endswith("requirements.txt")
+
+    async def test_upload_model_artifacts_keeps_identical_model_in_place(self, mock_storage_client):
+        """Test re-uploading a version's own model file stores only the requirements."""
+        service = StorageService()
+        stored_path = "s3://kubeserve-models/models/1/test_model/v1/model.joblib"
+        mock_storage_client.bucket_name = "kubeserve-models"
+        mock_storage_client.get_metadata.return_value = "ab" * 32
+        mock_storage_client.upload_stream.return_value = (
+            "s3://kubeserve-models/models/1/test_model/v1/requirements.txt"
+        )
+
+        model_path, _ = await service.upload_model_artifacts(
+            user_id=1,
+            model_name="Test Model",
+            version_tag="v1",
+            model_file=UploadFile(filename="model.joblib", file=BytesIO(b"model content")),
+            requirements_file=UploadFile(filename="requirements.txt", file=BytesIO(b"numpy")),
+            model_size=13,
+            requirements_size=5,
+            model_sha256="ab" * 32,
+            model_source=stored_path,
+        )
+
+        assert model_path == stored_path
+        mock_storage_client.copy_file.assert_not_called()
+        mock_storage_client.upload_stream.assert_called_once()
+        assert mock_storage_client.upload_stream.call_args[0][0].endswith("requirements.txt")
+
+    @pytest.mark.parametrize("version_tag", ["v1", "v2"])
+    async def test_upload_model_artifacts_uploads_over_changed_source(
+        self, mock_storage_client, version_tag
+    ):
+        """Test a recorded source whose content has since changed is not reused."""
+        service = StorageService()
+        mock_storage_client.bucket_name = "kubeserve-models"
+        # The key was overwritten by another model whose name sanitizes the same
+        mock_storage_client.get_metadata.return_value = "cd" * 32
+        mock_storage_client.upload_stream.side_effect = (
+            lambda object_name, *args, **kwargs: f"s3://kubeserve-models/{object_name}"
+        )
+
+        model_path, _ = await service.upload_model_artifacts(
+            user_id=1,
+            model_name="Test Model",
+            version_tag=version_tag,
+            model_file=UploadFile(filename="model.joblib", file=BytesIO(b"model content")),
+            requirements_file=UploadFile(filename="requirements.txt", file=BytesIO(b"numpy")),
+            model_size=13,
+            requirements_size=5,
+            model_sha256="ab" * 32,
+            model_source="s3://kubeserve-models/models/1/test_model/v1/model.joblib",
+        )
+
+        model_key = f"models/1/test_model/{version_tag}/model.joblib"
+        assert model_path == f"s3://kubeserve-models/{model_key}"
+        mock_storage_client.copy_file.assert_not_called()
+        mock_storage_client.upload_stream.assert_any_call(
+            model_key,
+            ANY,
+            13,
+            content_type="application/octet-stream",
+            metadata={"sha256": "ab" * 32},
+        )
+
 
 @pytest.mark.asyncio
 @pytest.mark.storage
@@ -385,32 +730,104 @@ class TestUploadEndpoint:
         requirements_content = b"numpy==1.0.0\npandas==2.0.0"
 
         # Mock the storage service
-        with patch('app.api.v1.models.StorageService') as mock_storage_service_class:
-            mock_storage_service = Mock()
-            mock_storage_service_class.return_value = mock_storage_service
-            mock_storage_service.upload_model_artifacts = AsyncMock(
-                return_value=(
-                    "s3://kubeserve-models/models/1/test_model/v1/model.joblib",
-                    "s3://kubeserve-models/models/1/test_model/v1/requirements.txt"
-                )
+        mock_storage_service = Mock()
+        mock_storage_service.validate_artifacts.return_value = (18, 26)
+        mock_storage_service.model_file_sha256 = AsyncMock(return_value="ab" * 32)
+        mock_storage_service.upload_model_artifacts = AsyncMock(
+            return_value=(
+                "s3://kubeserve-models/models/1/test_model/v1/model.joblib",
+                "s3://kubeserve-models/models/1/test_model/v1/requirements.txt"
             )
+        )
+        app.dependency_overrides[get_storage] = lambda: mock_storage_service
+
+        # Prepare multipart form data
+        files = {
+            "model_file": ("model.joblib", BytesIO(model_content), "application/octet-stream"),
+            "requirements_file": ("requirements.txt", BytesIO(requirements_content), "text/plain")
+        }
 
-            # Prepare multipart form data
+        response = await test_client.post(
+            f"/api/v1/versions/{test_model_version.id}/upload",
+            headers=auth_headers,
+            files=files,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["s3_path"] == "s3://kubeserve-models/models/1/test_model/v1/model.joblib"
+        assert data["id"] == test_model_version.id
+        assert mock_storage_service.upload_model_artifacts.call_args.kwargs["model_source"] is None
+
+    async def test_upload_reuses_stored_artifact(
+        self, test_client, auth_headers, test_model, test_model_version
+    ):
+        """Test a model file already stored for the user is passed as the copy source."""
+        stored_path = "s3://kubeserve-models/models/1/test_model/v1/model.joblib"
+        mock_storage_service = Mock()
+        mock_storage_service.validate_artifacts.return_value = (18, 26)
+        mock_storage_service.model_file_sha256 = AsyncMock(return_value="cd" * 32)
+        mock_storage_service.upload_model_artifacts = AsyncMock(
+            return_value=(stored_path, "s3://kubeserve-models/models/1/test_model/v1/requirements.txt")
+        )
+        app.dependency_overrides[get_storage] = lambda: mock_storage_service
+
+        for _ in range(2):
             files = {
-                "model_file": ("model.joblib", BytesIO(model_content), "application/octet-stream"),
-                "requirements_file": ("requirements.txt", BytesIO(requirements_content), "text/plain")
+                "model_file": ("model.joblib", BytesIO(b"same model"), "application/octet-stream"),
+                "requirements_file": ("requirements.txt", BytesIO(b"numpy==1.0.0"), "text/plain")
             }
+            response = await test_client.post(
+                f"/api/v1/versions/{test_model_version.id}/upload",
+                headers=auth_headers,
+                files=files,
+            )
+            assert response.status_code == 200
+
+        first, second = mock_storage_service.upload_model_artifacts.call_args_list
+        assert first.kwargs["model_source"] is None
+        assert second.kwargs["model_source"] == stored_path
+
+    @pytest.mark.parametrize(
+        "requirements_name, upload_error, expected_status",
+        [
+            ("requirements.exe", None, 400),
+            (
+                "requirements.txt",
+                S3Error("UploadError", "Upload failed", "resource", "request_id", "host_id", Mock()),
+                500,
+            ),
+        ],
+    )
+    async def test_failed_upload_keeps_version_status(
+        self,
+        test_client,
+        auth_headers,
+        test_session,
+        test_model_version,
+        requirements_name,
+        upload_error,
+        expected_status,
+    ):
+        """Test a rejected or failed upload leaves the version status unchanged."""
+        with patch('app.services.storage_service.StorageClient') as mock_client_class:
+            mock_client = mock_client_class.return_value
+            mock_client.upload_stream.side_effect = upload_error
+            app.dependency_overrides[get_storage] = StorageService
 
+            files = {
+                "model_file": ("model.joblib", BytesIO(b"fake model content"), "application/octet-stream"),
+                "requirements_file": (requirements_name, BytesIO(b"numpy==1.0.0"), "text/plain")
+            }
             response = await test_client.post(
                 f"/api/v1/versions/{test_model_version.id}/upload",
                 headers=auth_headers,
                 files=files,
             )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["s3_path"] == "s3://kubeserve-models/models/1/test_model/v1/model.joblib"
-            assert data["id"] == test_model_version.id
+        assert response.status_code == expected_status
+        await test_session.refresh(test_model_version)
+        assert test_model_version.status == ModelVersionStatus.READY
 
     async def test_upload_unauthorized(self, test_client, test_model_version):
         """Test upload without authentication."""
@@ -436,19 +853,20 @@ class TestUploadEndpoint:
         model_content = b"fake model content"
         requirements_content = b"numpy==1.0.0"
 
-        with patch('app.api.v1.models.StorageService'):
-            files = {
-                "model_file": ("model.joblib", BytesIO(model_content), "application/octet-stream"),
-                "requirements_file": ("requirements.txt", BytesIO(requirements_content), "text/plain")
-            }
+        app.dependency_overrides[get_storage] = lambda: Mock()
 
-            response = await test_client.post(
-                "/api/v1/versions/99999/upload",
-                headers=auth_headers,
-                files=files,
-            )
+        files = {
+            "model_file": ("model.joblib", BytesIO(model_content), "application/octet-stream"),
+            "requirements_file": ("requirements.txt", BytesIO(requirements_content), "text/plain")
+        }
+
+        response = await test_client.post(
+            "/api/v1/versions/99999/upload",
+            headers=auth_headers,
+            files=files,
+        )
 
-            assert response.status_code == 404
+        assert response.status_code == 404
 
     async def test_upload_other_user_version(
         self, test_client, auth_headers, test_user_2, test_session
@@ -479,21 +897,22 @@ class TestUploadEndpoint:
         model_content = b"fake model content"
         requirements_content = b"numpy==1.0.0"
 
-        with patch('app.api.v1.models.StorageService'):
-            files = {
-                "model_file": ("model.joblib", BytesIO(model_content), "application/octet-stream"),
-                "requirements_file": ("requirements.txt", BytesIO(requirements_content), "text/plain")
-            }
+        app.dependency_overrides[get_storage] = lambda: Mock()
 
-            response = await test_client.post(
-                f"/api/v1/versions/{other_version.id}/upload",
-                headers=auth_headers,
-                files=files,
-            )
+        files = {
+            "model_file": ("model.joblib", BytesIO(model_content), "application/octet-stream"),
+            "requirements_file": ("requirements.txt", BytesIO(requirements_content), "text/plain")
+        }
+
+        response = await test_client.post(
+            f"/api/v1/versions/{other_version.id}/upload",
+            headers=auth_headers,
+            files=files,
+        )
 
-            # Should return 403 Forbidden (access denied) or 404 Not Found
-            # Both are acceptable - 403 is more accurate for unauthorized access
-            assert response.status_code in [403, 404]
+        # Should return 403 Forbidden (access denied) or 404 Not Found
+        # Both are acceptable - 403 is more accurate for unauthorized access
+        assert response.status_code in [403, 404]
 
     async def test_upload_invalid_file_type(
         self, test_client, auth_headers, test_model_version